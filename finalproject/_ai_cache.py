@@ -0,0 +1,61 @@
+"""Persistent cache for AI responses.
+
+Entries are keyed by the SHA-256 of model + prompt, so an identical request
+(same task text) is answered from disk instead of issuing another paid API
+call. The cache lives next to the task store as ``.ai_cache.db`` (a shelve
+file) and only ever holds successful responses.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+import hashlib
+import shelve
+
+CACHE_NAME = ".ai_cache.db"
+
+
+def cache_key(model: str, prompt: str) -> str:
+    return hashlib.sha256((model + prompt).encode("utf-8")).hexdigest()
+
+
+def _db_path(store_path: Path) -> str:
+    return str(Path(store_path).parent / CACHE_NAME)
+
+
+@lru_cache(maxsize=256)
+def _lookup(db: str, key: str) -> Optional[str]:
+    # Memoized so repeated lookups in one process don't reopen the shelf;
+    # every write clears it.
+    try:
+        with shelve.open(db, flag="r") as shelf:
+            return shelf.get(key)
+    except Exception:
+        return None  # missing or unreadable cache is just a miss
+
+
+def get(store_path: Path, key: str) -> Optional[str]:
+    """Return the cached response for ``key``, or None on a miss."""
+    return _lookup(_db_path(store_path), key)
+
+
+def put(store_path: Path, key: str, content: str) -> None:
+    """Store a response; failures to write the cache are ignored."""
+    try:
+        with shelve.open(_db_path(store_path)) as shelf:
+            shelf[key] = content
+    except Exception:  # pragma: no cover - cache is best effort
+        pass
+    _lookup.cache_clear()
+
+
+def invalidate(store_path: Path, key: str) -> None:
+    """Drop ``key`` from the cache if present."""
+    try:
+        with shelve.open(_db_path(store_path)) as shelf:
+            shelf.pop(key, None)
+    except Exception:  # pragma: no cover - cache is best effort
+        pass
+    _lookup.cache_clear()
@@ -1,40 +1,39 @@
 import argparse
+import shlex
+import sys
 from pathlib import Path
-from dotenv import load_dotenv
-from task_manager import (
-    add_task,
-    list_tasks,
-    complete_task,
-    delete_task,
-    search_tasks,
-    prioritize_task,
-    set_priority,
-    edit_task,
-    suggest_tasks,
-    clear_tasks,
-    get_overview,
-)
-
-# Load environment variables (search common locations)
+from typing import List, Optional
+from task_manager import TaskStore
+
+# Environment files to search for the API key (first found wins)
 _env_search_order = [
     "key.env",  # legacy filename
     ".env",     # conventional filename
     Path(".venv") / "key.env",  # user placed inside virtual environment
 ]
-for _candidate in _env_search_order:
-    candidate_path = Path(__file__).parent / _candidate
-    if candidate_path.exists():
-        load_dotenv(candidate_path)  # stop at first found
-        break
+_env_loaded = False
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        description="CLI Task Manager with optional AI summarization"
-    )
-    sub = parser.add_subparsers(dest="command", required=True)
+def _load_env_once() -> None:
+    """Load environment variables for the AI commands.
+
+    python-dotenv is imported here rather than at module level so commands
+    that never talk to OpenAI don't pay for the import or the file scan.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    from dotenv import load_dotenv
+
+    for _candidate in _env_search_order:
+        candidate_path = Path(__file__).parent / _candidate
+        if candidate_path.exists():
+            load_dotenv(candidate_path)  # stop at first found
+            break
 
-    # add
+
+def _build_add(sub) -> None:
     p_add = sub.add_parser("add", help="Add a new task")
     p_add.add_argument("--title", required=True, help="Title of the task")
     p_add.add_argument("--description", default="", help="Detailed description")
@@ -52,7 +51,8 @@ def build_parser() -> argparse.ArgumentParser:
         help="Skip asking for due date/priority; sets no due and priority 3",
     )
 
-    # list
+
+def _build_list(sub) -> None:
     p_list = sub.add_parser("list", help="List tasks")
     p_list.add_argument(
         "--filter",
@@ -66,43 +66,70 @@ def build_parser() -> argparse.ArgumentParser:
         default="priority",
         help="Sort order",
     )
+    p_list.add_argument(
+        "--limit",
+        type=int,
+        help="Show only the first N tasks in sort order",
+    )
     p_list.add_argument(
         "--show-summary",
         action="store_true",
         help="Display AI-generated summaries (if available)",
     )
 
-    # complete
+
+def _build_complete(sub) -> None:
     p_complete = sub.add_parser("complete", help="Mark task complete")
     p_complete.add_argument("--id", type=int, required=True, help="Task ID")
 
-    # delete
+
+def _build_delete(sub) -> None:
     p_delete = sub.add_parser("delete", help="Delete a task")
     p_delete.add_argument("--id", type=int, required=True, help="Task ID")
 
-    # search
+
+def _build_search(sub) -> None:
     p_search = sub.add_parser("search", help="Search tasks by text")
     p_search.add_argument("--query", required=True, help="Search text")
 
-    # prioritize (AI-powered)
+
+def _build_prioritize(sub) -> None:
+    # AI-powered
     p_prio = sub.add_parser("prioritize", help="AI-powered task prioritization")
-    p_prio.add_argument("--id", type=int, required=True, help="Task ID")
+    target = p_prio.add_mutually_exclusive_group(required=True)
+    target.add_argument("--id", type=int, help="Task ID")
+    target.add_argument(
+        "--all", action="store_true", help="Prioritize all pending tasks concurrently"
+    )
+
 
-    # set-priority (manual)
+def _build_set_priority(sub) -> None:
+    # manual
     p_set_prio = sub.add_parser("set-priority", help="Manually set task priority")
     p_set_prio.add_argument("--id", type=int, required=True, help="Task ID")
     p_set_prio.add_argument(
         "--priority", type=int, required=True, help="Priority 1-5"
     )
 
-    # edit
+
+def _build_summarize(sub) -> None:
+    p_sum = sub.add_parser("summarize", help="Generate AI summaries for existing tasks")
+    target = p_sum.add_mutually_exclusive_group(required=True)
+    target.add_argument("--id", type=int, help="Task ID")
+    target.add_argument(
+        "--all", action="store_true", help="Summarize all tasks missing a summary"
+    )
+
+
+def _build_edit(sub) -> None:
     p_edit = sub.add_parser("edit", help="Edit an existing task")
     p_edit.add_argument("--id", type=int, required=True, help="Task ID")
     p_edit.add_argument("--title", help="New title")
     p_edit.add_argument("--description", help="New description")
     p_edit.add_argument("--due", help="New due date (YYYY-MM-DD)")
 
-    # suggest
+
+def _build_suggest(sub) -> None:
     p_suggest = sub.add_parser("suggest", help="Get AI task suggestions")
     p_suggest.add_argument(
         "--context",
@@ -110,7 +137,8 @@ def build_parser() -> argparse.ArgumentParser:
         help="Optional context for suggestions (e.g., 'work project', 'personal goals')",
     )
 
-    # clear
+
+def _build_clear(sub) -> None:
     p_clear = sub.add_parser("clear", help="Delete all tasks")
     p_clear.add_argument(
         "--yes",
@@ -118,12 +146,82 @@ def build_parser() -> argparse.ArgumentParser:
         help="Skip confirmation prompt",
     )
 
-    # overview
+
+def _build_overview(sub) -> None:
     sub.add_parser("overview", help="Show task statistics summary")
 
-    # options (list available commands)
+
+def _build_batch(sub) -> None:
+    sub.add_parser(
+        "batch",
+        help="Run commands read from stdin (one per line) against a single load of the store",
+    )
+
+
+def _build_options(sub) -> None:
+    # list available commands
     sub.add_parser("options", help="List all available commands")
 
+
+# Command name -> subparser builder, in the order shown by --help/options
+_SUBPARSER_BUILDERS = {
+    "add": _build_add,
+    "list": _build_list,
+    "complete": _build_complete,
+    "delete": _build_delete,
+    "search": _build_search,
+    "prioritize": _build_prioritize,
+    "set-priority": _build_set_priority,
+    "summarize": _build_summarize,
+    "edit": _build_edit,
+    "suggest": _build_suggest,
+    "clear": _build_clear,
+    "overview": _build_overview,
+    "batch": _build_batch,
+    "options": _build_options,
+}
+
+
+# One-line descriptions shown by ``options``
+_COMMAND_DESCRIPTIONS = {
+    "add": "Add a new task",
+    "list": "List tasks (filter/sort)",
+    "complete": "Mark a task complete",
+    "delete": "Delete a task",
+    "search": "Search tasks by text",
+    "prioritize": "AI-powered task prioritization (one task or --all)",
+    "set-priority": "Manually set task priority",
+    "summarize": "Generate AI summaries (one task or --all)",
+    "edit": "Edit an existing task",
+    "suggest": "Get AI task suggestions",
+    "clear": "Delete all tasks",
+    "overview": "Show task statistics summary",
+    "batch": "Run commands from stdin in one session",
+    "options": "Show this command list",
+}
+
+
+def build_parser(argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """Build the CLI parser.
+
+    Only the subparser for the command in ``argv[0]`` (default: ``sys.argv[1:]``)
+    is constructed. Help requests, unknown commands and ``options`` fall back
+    to building every subparser so usage/choices output stays complete.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = argparse.ArgumentParser(
+        description="CLI Task Manager with optional AI summarization"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    builder = _SUBPARSER_BUILDERS.get(argv[0]) if argv else None
+    if builder is None or argv[0] == "options":
+        for build in _SUBPARSER_BUILDERS.values():
+            build(sub)
+    else:
+        builder(sub)
+
     return parser
 
 
@@ -132,10 +230,40 @@ def main():
     args = parser.parse_args()
     store_path = Path(__file__).parent / "data" / "tasks.json"
 
+    with TaskStore(store_path) as store:
+        if args.command == "batch":
+            _run_batch(store)
+        else:
+            _run(args, store, parser)
+
+
+def _run_batch(store: TaskStore) -> None:
+    """Execute one command per stdin line, loading and saving the store once.
+
+    Lines are split shell-style (``#`` starts a comment). Commands never
+    prompt in batch mode: ``add`` behaves as if ``--quick`` was given and
+    ``clear`` requires ``--yes``.
+    """
+    parser = build_parser([])
+    for line in sys.stdin:
+        argv = shlex.split(line, comments=True)
+        if not argv:
+            continue
+        if argv[0] == "batch":
+            print("batch: nested batch is not supported")
+            continue
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit:
+            continue  # argparse already reported the problem
+        _run(args, store, parser, interactive=False)
+
+
+def _run(args, store: TaskStore, parser, interactive: bool = True) -> None:
     if args.command == "add":
         # Decide due date
         due = args.due
-        if due is None and not args.quick:
+        if due is None and not args.quick and interactive:
             entered = input("Enter due date (YYYY-MM-DD) or press Enter to skip: ").strip()
             if entered:
                 due = entered
@@ -143,7 +271,7 @@ def main():
         # Decide priority
         priority = args.priority
         if priority is None:
-            if args.quick:
+            if args.quick or not interactive:
                 priority = 3  # default silently
             else:
                 entered = input("Enter priority 1 (high) - 5 (low) or press Enter for 3: ").strip()
@@ -155,8 +283,9 @@ def main():
                 else:
                     priority = 3
 
-        task = add_task(
-            store_path,
+        if args.summarize:
+            _load_env_once()
+        task = store.add(
             title=args.title,
             description=args.description,
             due_date=due,
@@ -167,50 +296,76 @@ def main():
         if task.get('summary'):
             print(f"  Summary: {task['summary']}")
     elif args.command == "list":
-        tasks = list_tasks(store_path, filter_mode=args.filter, sort_mode=args.sort)
+        tasks = store.list(filter_mode=args.filter, sort_mode=args.sort, limit=args.limit)
         if not tasks:
             print("No tasks found.")
         else:
+            # Build every row first and write once; per-row print() is the
+            # bottleneck on a terminal for long lists.
+            show_summary = args.show_summary
+            rows = []
             for t in tasks:
                 status_icon = "✔" if t["status"] == "complete" else "✘"
                 due = t["due_date"] or "-"
-                print(
+                rows.append(
                     f"[{status_icon}] #{t['id']} (P{t['priority']}) due:{due} title:{t['title']}"
                 )
-                if args.show_summary and t.get('summary'):
-                    print(f"    Summary: {t['summary']}")
+                summary = t.get('summary') if show_summary else None
+                if summary:
+                    rows.append(f"    Summary: {summary}")
+            sys.stdout.write("\n".join(rows) + "\n")
     elif args.command == "complete":
-        if complete_task(store_path, args.id):
+        if store.complete(args.id):
             print(f"Task #{args.id} marked complete.")
         else:
             print(f"Task #{args.id} not found.")
     elif args.command == "delete":
-        if delete_task(store_path, args.id):
+        if store.delete(args.id):
             print(f"Task #{args.id} deleted.")
         else:
             print(f"Task #{args.id} not found.")
     elif args.command == "search":
-        results = search_tasks(store_path, args.query)
+        results = store.search(args.query)
         if not results:
             print("No matching tasks.")
         else:
+            rows = []
             for t in results:
                 status_icon = "✔" if t["status"] == "complete" else "✘"
-                print(f"[{status_icon}] #{t['id']} {t['title']} :: {t['description']}")
+                rows.append(f"[{status_icon}] #{t['id']} {t['title']} :: {t['description']}")
+            sys.stdout.write("\n".join(rows) + "\n")
     elif args.command == "prioritize":
-        priority = prioritize_task(store_path, args.id)
-        if priority is not None:
-            print(f"Task #{args.id} priority set to {priority} (AI-determined).")
+        _load_env_once()
+        if args.all:
+            results = store.prioritize_all()
+            if not results:
+                print("No tasks prioritized. Check OpenAI API key or pending tasks.")
+            for task_id, priority in results.items():
+                print(f"Task #{task_id} priority set to {priority} (AI-determined).")
+        else:
+            priority = store.prioritize(args.id)
+            if priority is not None:
+                print(f"Task #{args.id} priority set to {priority} (AI-determined).")
+            else:
+                print(f"Could not prioritize task #{args.id}. Check OpenAI API key or task ID.")
+    elif args.command == "summarize":
+        _load_env_once()
+        if args.all:
+            count = store.summarize_all()
+            print(f"Summarized {count} task(s).")
         else:
-            print(f"Could not prioritize task #{args.id}. Check OpenAI API key or task ID.")
+            summary = store.summarize(args.id)
+            if summary is not None:
+                print(f"Task #{args.id} summary: {summary}")
+            else:
+                print(f"Task #{args.id} not found.")
     elif args.command == "set-priority":
-        if set_priority(store_path, args.id, args.priority):
+        if store.set_priority(args.id, args.priority):
             print(f"Task #{args.id} priority manually set to {args.priority}.")
         else:
             print(f"Task #{args.id} not found or invalid priority.")
     elif args.command == "edit":
-        if edit_task(
-            store_path,
+        if store.edit(
             args.id,
             title=args.title,
             description=args.description,
@@ -220,21 +375,25 @@ def main():
         else:
             print(f"Task #{args.id} not found.")
     elif args.command == "suggest":
-        suggestions = suggest_tasks(store_path, context=args.context)
-        print("AI Task Suggestions:\n")
-        for i, suggestion in enumerate(suggestions, 1):
-            print(f"{i}. {suggestion}")
-        print("\nUse 'python main.py add --title \"<suggestion>\"' to add a task.")
+        _load_env_once()
+        suggestions = store.suggest(context=args.context)
+        rows = ["AI Task Suggestions:\n"]
+        rows.extend(f"{i}. {suggestion}" for i, suggestion in enumerate(suggestions, 1))
+        rows.append("\nUse 'python main.py add --title \"<suggestion>\"' to add a task.")
+        sys.stdout.write("\n".join(rows) + "\n")
     elif args.command == "clear":
         if not args.yes:
+            if not interactive:
+                print("Clear cancelled (pass --yes in batch mode).")
+                return
             confirm = input("Are you sure you want to delete ALL tasks? (yes/no): ").strip().lower()
             if confirm != "yes":
                 print("Clear cancelled.")
                 return
-        count = clear_tasks(store_path)
+        count = store.clear()
         print(f"Cleared {count} task(s).")
     elif args.command == "overview":
-        stats = get_overview(store_path)
+        stats = store.overview()
         print(f"You have {stats['total']} task(s).")
         parts = []
         if stats['high_priority'] > 0:
@@ -246,38 +405,13 @@ def main():
         if parts:
             print(", ".join(parts) + ".")
     elif args.command == "options":
-        # Rebuild parser to introspect subcommands
-        parser2 = build_parser()
-        print("Available commands:\n")
-        for name, sp in parser2._subparsers._group_actions[0].choices.items():  # type: ignore[attr-defined]
-            if name == "add":
-                desc = "Add a new task"
-            elif name == "list":
-                desc = "List tasks (filter/sort)"
-            elif name == "complete":
-                desc = "Mark a task complete"
-            elif name == "delete":
-                desc = "Delete a task"
-            elif name == "search":
-                desc = "Search tasks by text"
-            elif name == "prioritize":
-                desc = "AI-powered task prioritization"
-            elif name == "set-priority":
-                desc = "Manually set task priority"
-            elif name == "edit":
-                desc = "Edit an existing task"
-            elif name == "suggest":
-                desc = "Get AI task suggestions"
-            elif name == "clear":
-                desc = "Delete all tasks"
-            elif name == "overview":
-                desc = "Show task statistics summary"
-            elif name == "options":
-                desc = "Show this command list"
-            else:
-                desc = sp.description or "(no description)"
-            print(f" - {name}: {desc}")
-        print("\nUse 'python main.py <command> --help' for details.")
+        # "options" builds every subparser, so introspect the parser we have
+        rows = ["Available commands:\n"]
+        for name, sp in parser._subparsers._group_actions[0].choices.items():  # type: ignore[attr-defined]
+            desc = _COMMAND_DESCRIPTIONS.get(name) or sp.description or "(no description)"
+            rows.append(f" - {name}: {desc}")
+        rows.append("\nUse 'python main.py <command> --help' for details.")
+        sys.stdout.write("\n".join(rows) + "\n")
 
 
 if __name__ == "__main__":
@@ -11,73 +11,883 @@ Tasks are stored as a JSON array of objects with fields:
   summary       : str (optional AI generated)
 
 OpenAI summarization is optional. Set environment variable OPENAI_API_KEY.
+The openai package (and asyncio, for the batched helpers) is only imported
+the first time an AI feature runs.
 """
 
 from __future__ import annotations
 
+from bisect import bisect_right
+import heapq
+from itertools import islice
 from datetime import datetime, timezone
 from pathlib import Path
 import json
+import mmap
 import os
-from typing import List, Dict, Optional
+import random
+import re
+import time
+from typing import List, Dict, Optional, Set, Tuple
 
 try:
-    from openai import OpenAI  # type: ignore
-except Exception:  # pragma: no cover - openai may not be installed or available
-    OpenAI = None  # type: ignore
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None  # type: ignore
 
+# bytes <-> tasks codec: orjson when installed, stdlib json otherwise. Both
+# accept bytes and write the same indented, standard JSON.
+if orjson is not None:
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:  # pragma: no cover - exercised only without orjson
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
 
 Task = Dict[str, object]
 
+_TOKEN_RE = re.compile(r"\w+")
+_LIST_PREFIX_RE = re.compile(r"^[\s0-9.\-•*]+")
+# "Priority: <n>" / "Reason: <text>" lines of a prioritization response
+_PRIORITY_RE = re.compile(r"^Priority:[ \t]*(-?\d+)\s*$", re.M)
+_REASON_RE = re.compile(r"^Reason:(.*)$", re.M)
+
+# Sorts after every real due date
+_NO_DUE = "9999-12-31"
+
+
+def _priority_key(t: Task):
+    return (t["priority"], t.get("due_date") or _NO_DUE)
+
+
+def _due_key(t: Task):
+    return (t.get("due_date") or _NO_DUE, t["priority"])
+
+
+_SORT_KEYS = {"priority": _priority_key, "due": _due_key}
+# list filter_mode -> stored status value
+_STATUS_FILTERS = {"pending": "pending", "completed": "complete"}
+
+# Resolved lazily by _openai_class(); None once we know openai is unavailable.
+_UNRESOLVED = object()
+OpenAI = _UNRESOLVED  # type: ignore
+AsyncOpenAI = _UNRESOLVED  # type: ignore
+
+_AI_MODEL = "gpt-4o-mini"
+
+# Upper bound on in-flight requests for the batched (*_all) helpers
+_AI_CONCURRENCY = 10
+
+# Attempts per request (and base backoff in seconds) for transient API errors
+_AI_ATTEMPTS = 3
+_AI_BACKOFF = 0.5
+
+_client = None
+_client_cls = None
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
 
+_today_str = ""
+_today_until = 0.0
+
+
+def _today() -> str:
+    """Return today's UTC date as YYYY-MM-DD, cached until the next midnight."""
+    global _today_str, _today_until
+    now = time.time()
+    if now >= _today_until:
+        _today_str = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+        _today_until = (now // 86400 + 1) * 86400  # POSIX days are 86400s
+    return _today_str
+
+
+def _read_json(store_path: Path):
+    if orjson is None:
+        return _loads(store_path.read_bytes())
+    # Map the file and let orjson parse the bytes in place: no read() into an
+    # intermediate bytes/str copy before decoding.
+    fd = os.open(store_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if os.fstat(fd).st_size == 0:
+            return None  # mmap can't map an empty file
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        try:
+            with memoryview(mm) as view:
+                return _loads(view)
+        finally:
+            mm.close()
+    finally:
+        os.close(fd)
+
+
+# Parsed store contents by path, tagged with the (st_mtime_ns, st_size) they
+# were read at, so repeated loads of an unchanged file skip the JSON decode.
+_PARSED: Dict[Path, Tuple[int, int, List[Task]]] = {}
+# How many times this process has saved each path. A rewrite of the same
+# length within the filesystem's mtime granularity leaves (st_mtime_ns,
+# st_size) unchanged, so TaskStore stamps include this as well.
+_WRITES: Dict[Path, int] = {}
+
+
 def _load(store_path: Path) -> List[Task]:
-    if not store_path.exists():
-        return []
     try:
-        with store_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data
-        return []
-    except Exception:
+        st = store_path.stat()
+    except OSError:
         return []
+    cached = _PARSED.get(store_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        tasks = cached[2]
+    else:
+        try:
+            data = _read_json(store_path)
+        except Exception:
+            data = None
+        tasks = data if isinstance(data, list) else []
+        _PARSED[store_path] = (st.st_mtime_ns, st.st_size, tasks)
+    # Callers mutate the tasks they get back; values are scalars, so copying
+    # each dict keeps the cached copy intact.
+    return [dict(t) for t in tasks]
 
 
 def _save(store_path: Path, tasks: List[Task]) -> None:
-    with store_path.open("w", encoding="utf-8") as f:
-        json.dump(tasks, f, indent=2)
+    # Write the whole payload to a sibling temp file, then rename it over the
+    # store so a crash mid-write never leaves a truncated tasks.json behind.
+    tmp = store_path.with_name(store_path.name + ".tmp")
+    tmp.write_bytes(_dumps(tasks))
+    os.replace(tmp, store_path)
+    _WRITES[store_path] = _WRITES.get(store_path, 0) + 1
+    # Drop what was derived from the previous version rather than keeping it
+    # alive until the next store of this path rebuilds it.
+    for cache in (_SEARCH_INDEXES, _SORT_ORDERS):
+        for key in [k for k in cache if k[0] == store_path]:
+            del cache[key]
+    st = store_path.stat()
+    _PARSED[store_path] = (st.st_mtime_ns, st.st_size, [dict(t) for t in tasks])
+
+
+def _max_id(tasks: List[Task]) -> int:
+    return max((t["id"] for t in tasks), default=0)  # type: ignore[arg-type]
+
+
+def _openai_class():
+    """Import ``openai.OpenAI`` on first use; None if the package is missing."""
+    global OpenAI
+    if OpenAI is _UNRESOLVED:
+        try:
+            from openai import OpenAI as _OpenAI  # type: ignore
+        except Exception:  # pragma: no cover - openai may not be installed or available
+            _OpenAI = None
+        OpenAI = _OpenAI
+    return OpenAI
+
+
+def _async_openai_class():
+    """Import ``openai.AsyncOpenAI`` on first use; None if the package is missing."""
+    global AsyncOpenAI
+    if AsyncOpenAI is _UNRESOLVED:
+        try:
+            from openai import AsyncOpenAI as _AsyncOpenAI  # type: ignore
+        except Exception:  # pragma: no cover - openai may not be installed or available
+            _AsyncOpenAI = None
+        AsyncOpenAI = _AsyncOpenAI
+    return AsyncOpenAI
+
+
+def _retryable_errors() -> tuple:
+    """Transient OpenAI errors (429, timeouts, connection drops, 5xx)."""
+    try:
+        import openai  # type: ignore
+    except Exception:  # pragma: no cover - openai may not be installed or available
+        return ()
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+
+
+def _call_with_retry(fn, *, attempts: int = _AI_ATTEMPTS, base: float = _AI_BACKOFF):
+    """Call ``fn()``, retrying transient errors with jittered exponential backoff."""
+    for i in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if i == attempts - 1 or not isinstance(e, _retryable_errors()):
+                raise
+            time.sleep(random.uniform(0, base * 2**i))
+
+
+async def _acall_with_retry(fn, *, attempts: int = _AI_ATTEMPTS, base: float = _AI_BACKOFF):
+    """Async counterpart of _call_with_retry; ``fn()`` returns an awaitable."""
+    import asyncio
+    for i in range(attempts):
+        try:
+            return await fn()
+        except Exception as e:
+            if i == attempts - 1 or not isinstance(e, _retryable_errors()):
+                raise
+            await asyncio.sleep(random.uniform(0, base * 2**i))
+
+
+def _openai_available() -> bool:
+    # Check the key first so a missing key never triggers the openai import
+    return bool(os.getenv("OPENAI_API_KEY")) and _openai_class() is not None
+
+
+def _openai_client():
+    """Return a shared client, recreated only if the OpenAI class changed."""
+    global _client, _client_cls
+    cls = _openai_class()
+    if _client is None or _client_cls is not cls:
+        _client = cls(max_retries=0)  # retries handled by _call_with_retry
+        _client_cls = cls
+    return _client
+
+
+def _complete(store_path: Optional[Path], prompt: str, **params) -> str:
+    """Run one chat completion, answering from the response cache when possible.
 
+    Successful responses are written to the cache next to ``store_path``;
+    pass None to bypass it. Errors propagate to the caller.
+    """
+    import _ai_cache  # deferred: shelve/dbm are only needed once AI runs
 
-def _next_id(tasks: List[Task]) -> int:
-    return (max((t["id"] for t in tasks), default=0) + 1)  # type: ignore[arg-type]
+    key = _ai_cache.cache_key(_AI_MODEL, prompt)
+    if store_path is not None:
+        cached = _ai_cache.get(store_path, key)
+        if cached is not None:
+            return cached
+    client = _openai_client()
+    resp = _call_with_retry(lambda: client.chat.completions.create(
+        model=_AI_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        **params,
+    ))
+    content = resp.choices[0].message.content.strip()
+    if store_path is not None:
+        _ai_cache.put(store_path, key, content)
+    return content
 
 
-def _generate_summary(title: str, description: str) -> str:
+async def _acomplete(client, store_path: Path, prompt: str, **params) -> str:
+    """Async counterpart of _complete using a shared AsyncOpenAI client."""
+    import _ai_cache
+
+    key = _ai_cache.cache_key(_AI_MODEL, prompt)
+    cached = _ai_cache.get(store_path, key)
+    if cached is not None:
+        return cached
+    resp = await _acall_with_retry(lambda: client.chat.completions.create(
+        model=_AI_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        **params,
+    ))
+    content = resp.choices[0].message.content.strip()
+    _ai_cache.put(store_path, key, content)
+    return content
+
+
+_SUMMARY_TMPL = (
+    "Summarize the following task concisely (<= 30 words).\n"
+    "Title: {title}\nDescription: {description}"
+)
+
+
+def _summary_prompt(title: str, description: str) -> str:
+    return _SUMMARY_TMPL.format_map({"title": title, "description": description})
+
+
+def _generate_summary(
+    title: str, description: str, store_path: Optional[Path] = None
+) -> str:
     # Graceful fallback if OpenAI unavailable
-    if OpenAI is None or not os.getenv("OPENAI_API_KEY"):
+    if not _openai_available():
         return "(Summary unavailable: OpenAI API key not set)"
     try:
-        client = OpenAI()
-        prompt = (
-            "Summarize the following task concisely (<= 30 words).\n"
-            f"Title: {title}\nDescription: {description}"
-        )
         # Using chat completion for summarization
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+        return _complete(
+            store_path,
+            _summary_prompt(title, description),
             max_tokens=60,
             temperature=0.4,
         )
-        return resp.choices[0].message.content.strip()
     except Exception as e:  # pragma: no cover
         return f"(Summary error: {e.__class__.__name__})"
 
 
+_PRIORITIZE_TMPL = (
+    "You are a task prioritization expert. Analyze the following task and assign a priority level "
+    "from 1 (highest/most urgent) to 5 (lowest/least urgent).\n\n"
+    "Task Title: {title}\n"
+    "Description: {description}\n"
+    "Due Date: {due}\n\n"
+    "Consider:\n"
+    "- Urgency (due date proximity)\n"
+    "- Importance (impact and consequences)\n"
+    "- Dependencies and blocking factors\n"
+    "- Complexity and time required\n\n"
+    "Respond with ONLY a single number (1-5) and a brief explanation (max 40 words) in this format:\n"
+    "Priority: <number>\n"
+    "Reason: <explanation>"
+)
+
+
+def _prioritize_prompt(task: Task) -> str:
+    """Build the prompt for AI priority assessment of one task."""
+    return _PRIORITIZE_TMPL.format_map({
+        "title": task["title"],
+        "description": task.get("description", "N/A"),
+        "due": task.get("due_date", "Not set"),
+    })
+
+
+def _parse_priority(content: str) -> Tuple[int, str]:
+    """Parse ``(priority, reason)`` from a prioritization response; priority defaults to 3."""
+    m = _PRIORITY_RE.search(content)
+    priority = int(m.group(1)) if m else 3
+    if priority < 1 or priority > 5:
+        priority = 3
+    m = _REASON_RE.search(content)
+    reason = m.group(1).strip() if m else ""
+    return priority, reason
+
+
+_SUGGEST_HEADER = (
+    "You are a productivity assistant. Based on the following information, "
+    "suggest 3-5 new tasks that would be helpful.\n\n"
+)
+_SUGGEST_FOOTER = (
+    "Provide task suggestions as a simple list. "
+    "Each suggestion should be concise (one line per task). "
+    "Format: just the task title/description, no numbers or bullets."
+)
+
+
+def _suggest_prompt(pending_tasks: List[Task], context: str) -> str:
+    parts = [_SUGGEST_HEADER]
+    # Context from existing tasks, limited to the first 10
+    if pending_tasks:
+        parts.append("Current pending tasks:\n")
+        for t in pending_tasks[:10]:
+            desc = t.get('description')
+            parts.append(f"- {t['title']}: {desc}\n" if desc else f"- {t['title']}\n")
+        parts.append("\n")
+    if context:
+        parts.append(f"Additional context: {context}\n\n")
+    parts.append(_SUGGEST_FOOTER)
+    return "".join(parts)
+
+
+def _clean_suggestions(content: str) -> List[str]:
+    # Drop list prefixes (numbers, bullets, dashes) and blank lines
+    return [s for s in (_LIST_PREFIX_RE.sub("", ln).strip() for ln in content.splitlines()) if s]
+
+
+# --- Batched AI operations -------------------------------------------------
+#
+# The single-task requests issue one blocking call at a time, so bulk work is
+# dominated by network round trips. TaskStore.prioritize_all/summarize_all
+# share one AsyncOpenAI client and keep up to _AI_CONCURRENCY requests in
+# flight.
+
+
+async def _aprioritize(client, store_path: Path, task: Task) -> Optional[int]:
+    try:
+        content = await _acomplete(
+            client,
+            store_path,
+            _prioritize_prompt(task),
+            max_tokens=100,
+            temperature=0.3,
+        )
+        return _parse_priority(content)[0]
+    except Exception as e:
+        print(f"(Prioritization error for #{task['id']}: {e.__class__.__name__})")
+        return None
+
+
+async def _asummarize(client, store_path: Path, t: Task) -> str:
+    try:
+        return await _acomplete(
+            client,
+            store_path,
+            _summary_prompt(t["title"], t.get("description", "")),
+            max_tokens=60,
+            temperature=0.4,
+        )
+    except Exception as e:
+        return f"(Summary error: {e.__class__.__name__})"
+
+
+def _run_batch(worker, store_path: Path, tasks: List[Task]) -> list:
+    """Run ``worker(client, store_path, task)`` for every task with bounded concurrency."""
+    import asyncio  # deferred like openai: only the batched helpers need it
+
+    async def runner():
+        sem = asyncio.Semaphore(_AI_CONCURRENCY)
+        client = _async_openai_class()(max_retries=0)
+
+        async def bounded(t: Task):
+            async with sem:
+                return await worker(client, store_path, t)
+
+        async with client:
+            return await asyncio.gather(*(bounded(t) for t in tasks))
+
+    return asyncio.run(runner())
+
+
+# Structures derived from a store file, keyed by (path, kind) and tagged with
+# the TaskStore stamp they were built at; see TaskStore._shared.
+# Entries are replaced, never mutated.
+_SEARCH_INDEXES: Dict[Tuple[Path, object], Tuple[Tuple[int, int, int], tuple]] = {}
+# sort_mode -> positions of the tasks in that order
+_SORT_ORDERS: Dict[Tuple[Path, object], Tuple[Tuple[int, int, int], List[int]]] = {}
+
+
+class TaskStore:
+    """A task file held in memory across several operations.
+
+    Use as a context manager: the file is parsed on entry (and re-parsed only
+    if it changed on disk since), operations mutate the in-memory list, and
+    the result is written back once on exit if anything changed. The
+    module-level functions each run one operation in their own TaskStore.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._tasks: List[Task] = []
+        self._by_id: Dict[int, Task] = {}
+        self._max_id = 0
+        self._dirty = False
+        self._loaded = False
+        # (st_mtime_ns, st_size, saves by this process) of the file as last
+        # loaded or saved
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        # Search structures, rebuilt lazily: token -> positions in _tasks,
+        # each task's lowercased (title, description, summary), and all of
+        # that text joined into one string with the offset each task starts at.
+        self._inverted: Dict[str, Set[int]] = {}
+        self._lowered: List[Tuple[str, str, str]] = []
+        self._blob = ""
+        self._blob_starts: List[int] = []
+        self._inv_dirty = True
+
+    def __enter__(self) -> "TaskStore":
+        self._load_if_stale()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def _stat_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, _WRITES.get(self.path, 0)
+
+    def _load_if_stale(self) -> None:
+        if self._dirty:
+            return  # unsaved changes win over edits made on disk meanwhile
+        stamp = self._stat_stamp()
+        if self._loaded and stamp == self._stamp:
+            return
+        self._tasks = _load(self.path)
+        self._by_id = {t["id"]: t for t in self._tasks}  # type: ignore[misc]
+        self._max_id = _max_id(self._tasks)
+        self._stamp = stamp
+        self._loaded = True
+        self._inv_dirty = True
+
+    def flush(self) -> None:
+        """Write the tasks back to disk if they changed since the last load."""
+        if self._dirty:
+            _save(self.path, self._tasks)
+            self._stamp = self._stat_stamp()
+            self._dirty = False
+
+    def _shared(self, cache: Dict, key: object, build):
+        """Return ``build()``, reused through ``cache`` by other stores.
+
+        While the tasks match the file on disk, every store of that file
+        sees the same task order, so anything derived from it (search
+        index, sort orders) can be built once per file version. Stores with
+        unsaved changes always build their own.
+        """
+        if self._dirty or self._stamp is None:
+            return build()
+        hit = cache.get((self.path, key))
+        if hit is not None and hit[0] == self._stamp:
+            return hit[1]
+        value = build()
+        cache[(self.path, key)] = (self._stamp, value)
+        return value
+
+    def _rebuild_inverted(self) -> None:
+        (
+            self._inverted,
+            self._lowered,
+            self._blob,
+            self._blob_starts,
+        ) = self._shared(_SEARCH_INDEXES, None, self._build_search_index)
+        self._inv_dirty = False
+
+    def _build_search_index(self):
+        inverted: Dict[str, Set[int]] = {}
+        lowered = []
+        for pos, t in enumerate(self._tasks):
+            fields = (
+                str(t.get("title", "")).lower(),
+                str(t.get("description", "")).lower(),
+                str(t.get("summary", "")).lower(),
+            )
+            lowered.append(fields)
+            for token in _TOKEN_RE.findall(" ".join(fields)):
+                inverted.setdefault(token, set()).add(pos)
+        segments = ["\x01".join(fields) for fields in lowered]
+        starts = []
+        offset = 0
+        for segment in segments:
+            starts.append(offset)
+            offset += len(segment) + 1
+        return inverted, lowered, "\x00".join(segments), starts
+
+    def _blob_matches(self, q: str) -> List[int]:
+        """Positions of tasks containing ``q``, found with str.find over the blob.
+
+        One C-level scan of the joined text replaces per-task ``in`` checks.
+        ``q`` must not contain the separator characters.
+        """
+        blob, starts = self._blob, self._blob_starts
+        hits = []
+        i = blob.find(q)
+        while i != -1:
+            pos = bisect_right(starts, i) - 1
+            hits.append(pos)
+            if pos + 1 == len(starts):
+                break
+            i = blob.find(q, starts[pos + 1])  # skip to the next task
+        return hits
+
+    def _search_candidates(self, q: str):
+        """Positions of tasks that may contain ``q``, in store order.
+
+        A single-word query is looked up in the inverted index: if it occurs
+        in a task's text it occurs inside one of that task's tokens, so the
+        postings of matching tokens are a superset of the matches (callers
+        still verify the substring). Anything else (several words,
+        punctuation) is found by scanning the joined blob.
+        """
+        if not q or "\x00" in q or "\x01" in q:
+            return range(len(self._tasks))
+        if not _TOKEN_RE.fullmatch(q):
+            return self._blob_matches(q)
+        candidates: Set[int] = set()
+        for token, positions in self._inverted.items():
+            if q in token:
+                candidates |= positions
+        return sorted(candidates)
+
+    def _next_id(self) -> int:
+        self._max_id += 1
+        return self._max_id
+
+    def _find(self, task_id: int) -> Optional[Task]:
+        return self._by_id.get(task_id)
+
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return the task with ``task_id``, or None."""
+        return self._by_id.get(task_id)
+
+    def add(
+        self,
+        title: str,
+        description: str = "",
+        due_date: Optional[str] = None,
+        priority: int = 3,
+        summarize: bool = False,
+    ) -> Task:
+        if priority < 1 or priority > 5:
+            priority = 3
+        if due_date:
+            try:
+                datetime.strptime(due_date, "%Y-%m-%d")
+            except ValueError:
+                due_date = None
+        task: Task = {
+            "id": self._next_id(),
+            "title": title,
+            "description": description,
+            "created_at": _now_iso(),
+            "due_date": due_date,
+            "priority": priority,
+            "status": "pending",
+            "summary": _generate_summary(title, description, self.path) if summarize else "",
+        }
+        self._tasks.append(task)
+        self._by_id[task["id"]] = task  # type: ignore[index]
+        self._dirty = True
+        self._inv_dirty = True
+        return task
+
+    def list(
+        self,
+        filter_mode: str = "all",
+        sort_mode: str = "priority",
+        limit: Optional[int] = None,
+    ) -> List[Task]:
+        status = _STATUS_FILTERS.get(filter_mode)
+        if sort_mode not in _SORT_KEYS:
+            sort_mode = "priority"
+        sort_key = _SORT_KEYS[sort_mode]
+
+        if not self._dirty and self._stamp is not None:
+            # Walk the file's cached sort order instead of sorting again
+            tasks = self._tasks
+            order = self._shared(
+                _SORT_ORDERS,
+                sort_mode,
+                lambda: sorted(range(len(tasks)), key=lambda i: sort_key(tasks[i])),
+            )
+            ordered = (tasks[i] for i in order)
+            if status is not None:
+                ordered = (t for t in ordered if t["status"] == status)
+            if limit is not None:
+                return list(islice(ordered, max(limit, 0)))
+            return list(ordered)
+
+        tasks = self._tasks
+        if status is not None:
+            tasks = [t for t in tasks if t["status"] == status]
+
+        if limit is not None and limit < len(tasks):
+            # Top-k selection, O(n log k); same order as sorted(...)[:limit]
+            return heapq.nsmallest(max(limit, 0), tasks, key=sort_key)
+        return sorted(tasks, key=sort_key)
+
+    def complete(self, task_id: int) -> bool:
+        t = self._find(task_id)
+        if t is None:
+            return False
+        if t["status"] != "complete":
+            t["status"] = "complete"
+            self._dirty = True
+        return True
+
+    def delete(self, task_id: int) -> bool:
+        t = self._by_id.pop(task_id, None)
+        if t is None:
+            return False
+        self._tasks.remove(t)
+        if task_id == self._max_id:
+            # Like max()+1 did, let the next task reuse the freed top id
+            self._max_id = _max_id(self._tasks)
+        self._dirty = True
+        self._inv_dirty = True
+        return True
+
+    def search(self, query: str) -> List[Task]:
+        q = query.lower()
+        if self._inv_dirty:
+            self._rebuild_inverted()
+        # Separate prefix matches from other matches
+        prefix_matches = []
+        other_matches = []
+        
+        for pos in self._search_candidates(q):
+            title_lower, desc_lower, summary_lower = self._lowered[pos]
+            
+            # Check if title starts with query (prioritize these)
+            if title_lower.startswith(q):
+                prefix_matches.append(self._tasks[pos])
+            # Check if query appears anywhere in title, description, or summary
+            elif q in title_lower or q in desc_lower or q in summary_lower:
+                other_matches.append(self._tasks[pos])
+        
+        # Return prefix matches first, then other matches
+        return prefix_matches + other_matches
+
+    def set_priority(self, task_id: int, priority: int) -> bool:
+        if priority < 1 or priority > 5:
+            return False
+        t = self._find(task_id)
+        if t is None:
+            return False
+        if t["priority"] != priority:
+            t["priority"] = priority
+            self._dirty = True
+        return True
+
+    def prioritize(self, task_id: int) -> Optional[int]:
+        if not _openai_available():
+            return None
+        target_task = self._find(task_id)
+        if not target_task:
+            return None
+        
+        try:
+            content = _complete(
+                self.path,
+                _prioritize_prompt(target_task),
+                max_tokens=100,
+                temperature=0.3,
+            )
+            priority, reason = _parse_priority(content)
+            
+            # Update the task
+            if target_task["priority"] != priority:
+                target_task["priority"] = priority
+                self._dirty = True
+            
+            # Store reason in description if user wants
+            print(f"AI Reasoning: {reason}")
+            return priority
+            
+        except Exception as e:
+            print(f"(Prioritization error: {e.__class__.__name__})")
+            return None
+
+    def edit(
+        self,
+        task_id: int,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        due_date: Optional[str] = None,
+    ) -> bool:
+        t = self._find(task_id)
+        if t is None:
+            return False
+        old_title, old_desc = t["title"], t.get("description", "")
+        old_due = t.get("due_date")
+        if title is not None:
+            t["title"] = title
+        if description is not None:
+            t["description"] = description
+        if due_date is not None:
+            if due_date:
+                try:
+                    datetime.strptime(due_date, "%Y-%m-%d")
+                    t["due_date"] = due_date
+                except ValueError:
+                    pass  # Keep existing date if invalid
+            else:
+                t["due_date"] = None
+        text_changed = (t["title"], t.get("description", "")) != (old_title, old_desc)
+        if text_changed and t.get("summary"):
+            # The cached summary describes text that no longer exists
+            import _ai_cache
+
+            _ai_cache.invalidate(
+                self.path,
+                _ai_cache.cache_key(_AI_MODEL, _summary_prompt(old_title, old_desc)),
+            )
+        if text_changed:
+            self._dirty = True
+            self._inv_dirty = True
+        elif t.get("due_date") != old_due:
+            self._dirty = True
+        return True
+
+    def summarize(self, task_id: int) -> Optional[str]:
+        t = self._find(task_id)
+        if t is None:
+            return None
+        t["summary"] = _generate_summary(t["title"], t.get("description", ""), self.path)
+        self._dirty = True
+        self._inv_dirty = True
+        return t["summary"]
+
+    def clear(self) -> int:
+        count = len(self._tasks)
+        if count > 0:
+            self._tasks = []
+            self._by_id = {}
+            self._max_id = 0
+            self._dirty = True
+            self._inv_dirty = True
+        return count
+
+    def overview(self) -> Dict[str, int]:
+        # YYYY-MM-DD strings order the same way as the dates they encode, so
+        # overdue is a string comparison; the length check skips malformed dates.
+        today = _today()
+        total = incomplete = high_priority = overdue = 0
+        for t in self._tasks:
+            total += 1
+            if t["status"] != "pending":
+                continue
+            incomplete += 1
+            if t["priority"] <= 2:
+                high_priority += 1
+            due = t.get("due_date")
+            if due and len(due) == 10 and due < today:
+                overdue += 1
+        
+        return {
+            "total": total,
+            "incomplete": incomplete,
+            "high_priority": high_priority,
+            "overdue": overdue,
+        }
+
+    def suggest(self, context: str = "") -> List[str]:
+        if not _openai_available():
+            return ["(Task suggestions unavailable: OpenAI API key not set)"]
+        pending_tasks = [t for t in self._tasks if t["status"] == "pending"]
+        prompt = _suggest_prompt(pending_tasks, context)
+        
+        try:
+            client = _openai_client()
+            resp = _call_with_retry(lambda: client.chat.completions.create(
+                model=_AI_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=300,
+                temperature=0.7,
+            ))
+            cleaned = _clean_suggestions(resp.choices[0].message.content.strip())
+            return cleaned if cleaned else ["No suggestions generated"]
+        except Exception as e:
+            return [f"(Suggestion error: {e.__class__.__name__})"]
+
+    def prioritize_all(self) -> Dict[int, int]:
+        if not os.getenv("OPENAI_API_KEY") or _async_openai_class() is None:
+            return {}
+        pending = [t for t in self._tasks if t["status"] == "pending"]
+        if not pending:
+            return {}
+
+        results: Dict[int, int] = {}
+        for t, priority in zip(pending, _run_batch(_aprioritize, self.path, pending)):
+            if priority is not None:
+                t["priority"] = priority
+                results[t["id"]] = priority  # type: ignore[index]
+        if results:
+            self._dirty = True
+        return results
+
+    def summarize_all(self) -> int:
+        if not os.getenv("OPENAI_API_KEY") or _async_openai_class() is None:
+            return 0
+        missing = [t for t in self._tasks if not t.get("summary")]
+        if not missing:
+            return 0
+
+        for t, summary in zip(missing, _run_batch(_asummarize, self.path, missing)):
+            t["summary"] = summary
+        self._dirty = True
+        self._inv_dirty = True
+        return len(missing)
+
+
 def add_task(
     store_path: Path,
     title: str,
@@ -86,174 +896,60 @@ def add_task(
     priority: int = 3,
     summarize: bool = False,
 ) -> Task:
-    tasks = _load(store_path)
-    if priority < 1 or priority > 5:
-        priority = 3
-    if due_date:
-        try:
-            datetime.strptime(due_date, "%Y-%m-%d")
-        except ValueError:
-            due_date = None
-    task: Task = {
-        "id": _next_id(tasks),
-        "title": title,
-        "description": description,
-        "created_at": _now_iso(),
-        "due_date": due_date,
-        "priority": priority,
-        "status": "pending",
-        "summary": _generate_summary(title, description) if summarize else "",
-    }
-    tasks.append(task)
-    _save(store_path, tasks)
-    return task
+    with TaskStore(store_path) as store:
+        return store.add(title, description, due_date, priority, summarize)
+
+
+def add_tasks(store_path: Path, items: List[Dict[str, object]]) -> List[Task]:
+    """Add several tasks with one load and one save.
+
+    Each item holds the keyword arguments ``add_task`` takes (title is required).
+    """
+    with TaskStore(store_path) as store:
+        return [store.add(**kw) for kw in items]  # type: ignore[arg-type]
+
+
+def get_task(store_path: Path, task_id: int) -> Optional[Task]:
+    with TaskStore(store_path) as store:
+        return store.get(task_id)
 
 
 def list_tasks(
     store_path: Path,
     filter_mode: str = "all",
     sort_mode: str = "priority",
+    limit: Optional[int] = None,
 ) -> List[Task]:
-    tasks = _load(store_path)
-    if filter_mode == "pending":
-        tasks = [t for t in tasks if t["status"] == "pending"]
-    elif filter_mode == "completed":
-        tasks = [t for t in tasks if t["status"] == "complete"]
-
-    def sort_key(t: Task):
-        due = t.get("due_date") or "9999-12-31"
-        if sort_mode == "due":
-            return (due, t["priority"])
-        return (t["priority"], due)
-
-    return sorted(tasks, key=sort_key)
+    """List tasks, optionally only the first ``limit`` in sort order."""
+    with TaskStore(store_path) as store:
+        return store.list(filter_mode, sort_mode, limit)
 
 
 def complete_task(store_path: Path, task_id: int) -> bool:
-    tasks = _load(store_path)
-    for t in tasks:
-        if t["id"] == task_id:
-            t["status"] = "complete"
-            _save(store_path, tasks)
-            return True
-    return False
+    with TaskStore(store_path) as store:
+        return store.complete(task_id)
 
 
 def delete_task(store_path: Path, task_id: int) -> bool:
-    tasks = _load(store_path)
-    new_tasks = [t for t in tasks if t["id"] != task_id]
-    if len(new_tasks) != len(tasks):
-        _save(store_path, new_tasks)
-        return True
-    return False
+    with TaskStore(store_path) as store:
+        return store.delete(task_id)
 
 
 def search_tasks(store_path: Path, query: str) -> List[Task]:
-    tasks = _load(store_path)
-    q = query.lower()
-    # Separate prefix matches from other matches
-    prefix_matches = []
-    other_matches = []
-    
-    for t in tasks:
-        title_lower = str(t.get("title", "")).lower()
-        desc_lower = str(t.get("description", "")).lower()
-        summary_lower = str(t.get("summary", "")).lower()
-        
-        # Check if title starts with query (prioritize these)
-        if title_lower.startswith(q):
-            prefix_matches.append(t)
-        # Check if query appears anywhere in title, description, or summary
-        elif q in title_lower or q in desc_lower or q in summary_lower:
-            other_matches.append(t)
-    
-    # Return prefix matches first, then other matches
-    return prefix_matches + other_matches
+    with TaskStore(store_path) as store:
+        return store.search(query)
 
 
 def set_priority(store_path: Path, task_id: int, priority: int) -> bool:
     """Manually set task priority (1-5)."""
-    if priority < 1 or priority > 5:
-        return False
-    tasks = _load(store_path)
-    for t in tasks:
-        if t["id"] == task_id:
-            t["priority"] = priority
-            _save(store_path, tasks)
-            return True
-    return False
+    with TaskStore(store_path) as store:
+        return store.set_priority(task_id, priority)
 
 
 def prioritize_task(store_path: Path, task_id: int) -> Optional[int]:
     """Use OpenAI to intelligently determine and set task priority based on content."""
-    if OpenAI is None or not os.getenv("OPENAI_API_KEY"):
-        return None
-    
-    tasks = _load(store_path)
-    target_task = None
-    for t in tasks:
-        if t["id"] == task_id:
-            target_task = t
-            break
-    
-    if not target_task:
-        return None
-    
-    # Build prompt for AI priority assessment
-    prompt = (
-        "You are a task prioritization expert. Analyze the following task and assign a priority level "
-        "from 1 (highest/most urgent) to 5 (lowest/least urgent).\n\n"
-        f"Task Title: {target_task['title']}\n"
-        f"Description: {target_task.get('description', 'N/A')}\n"
-        f"Due Date: {target_task.get('due_date', 'Not set')}\n\n"
-        "Consider:\n"
-        "- Urgency (due date proximity)\n"
-        "- Importance (impact and consequences)\n"
-        "- Dependencies and blocking factors\n"
-        "- Complexity and time required\n\n"
-        "Respond with ONLY a single number (1-5) and a brief explanation (max 40 words) in this format:\n"
-        "Priority: <number>\n"
-        "Reason: <explanation>"
-    )
-    
-    try:
-        client = OpenAI()
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=100,
-            temperature=0.3,
-        )
-        content = resp.choices[0].message.content.strip()
-        
-        # Parse priority from response
-        priority = None
-        reason = ""
-        for line in content.split("\n"):
-            if line.startswith("Priority:"):
-                try:
-                    priority = int(line.split(":")[1].strip())
-                    if priority < 1 or priority > 5:
-                        priority = 3
-                except (ValueError, IndexError):
-                    priority = 3
-            elif line.startswith("Reason:"):
-                reason = line.split(":", 1)[1].strip()
-        
-        if priority is None:
-            priority = 3
-        
-        # Update the task
-        target_task["priority"] = priority
-        _save(store_path, tasks)
-        
-        # Store reason in description if user wants
-        print(f"AI Reasoning: {reason}")
-        return priority
-        
-    except Exception as e:
-        print(f"(Prioritization error: {e.__class__.__name__})")
-        return None
+    with TaskStore(store_path) as store:
+        return store.prioritize(task_id)
 
 
 def edit_task(
@@ -264,130 +960,66 @@ def edit_task(
     due_date: Optional[str] = None,
 ) -> bool:
     """Edit an existing task's fields."""
-    tasks = _load(store_path)
-    for t in tasks:
-        if t["id"] == task_id:
-            if title is not None:
-                t["title"] = title
-            if description is not None:
-                t["description"] = description
-            if due_date is not None:
-                if due_date:
-                    try:
-                        datetime.strptime(due_date, "%Y-%m-%d")
-                        t["due_date"] = due_date
-                    except ValueError:
-                        pass  # Keep existing date if invalid
-                else:
-                    t["due_date"] = None
-            _save(store_path, tasks)
-            return True
-    return False
+    with TaskStore(store_path) as store:
+        return store.edit(task_id, title, description, due_date)
+
+
+def summarize_task(store_path: Path, task_id: int) -> Optional[str]:
+    """Generate (or regenerate) the AI summary of an existing task."""
+    with TaskStore(store_path) as store:
+        return store.summarize(task_id)
 
 
 def clear_tasks(store_path: Path) -> int:
     """Delete all tasks. Returns count of tasks deleted."""
-    tasks = _load(store_path)
-    count = len(tasks)
-    if count > 0:
-        _save(store_path, [])
-    return count
+    with TaskStore(store_path) as store:
+        return store.clear()
 
 
 def get_overview(store_path: Path) -> Dict[str, int]:
     """Get task statistics overview."""
-    tasks = _load(store_path)
-    total = len(tasks)
-    incomplete = len([t for t in tasks if t["status"] == "pending"])
-    
-    # Count by priority (only pending tasks)
-    pending_tasks = [t for t in tasks if t["status"] == "pending"]
-    high_priority = len([t for t in pending_tasks if t["priority"] <= 2])
-    
-    # Count overdue tasks
-    today = datetime.now(timezone.utc).date()
-    overdue = 0
-    for t in pending_tasks:
-        if t.get("due_date"):
-            try:
-                due = datetime.strptime(t["due_date"], "%Y-%m-%d").date()
-                if due < today:
-                    overdue += 1
-            except ValueError:
-                pass
-    
-    return {
-        "total": total,
-        "incomplete": incomplete,
-        "high_priority": high_priority,
-        "overdue": overdue,
-    }
+    with TaskStore(store_path) as store:
+        return store.overview()
 
 
 def suggest_tasks(store_path: Path, context: str = "") -> List[str]:
     """Use OpenAI to suggest new tasks based on existing tasks and optional context."""
-    if OpenAI is None or not os.getenv("OPENAI_API_KEY"):
-        return ["(Task suggestions unavailable: OpenAI API key not set)"]
-    
-    tasks = _load(store_path)
-    pending_tasks = [t for t in tasks if t["status"] == "pending"]
-    
-    # Build context from existing tasks
-    task_summary = ""
-    if pending_tasks:
-        task_summary = "Current pending tasks:\n"
-        for t in pending_tasks[:10]:  # Limit to 10 most relevant tasks
-            task_summary += f"- {t['title']}"
-            if t.get('description'):
-                task_summary += f": {t['description']}"
-            task_summary += "\n"
-    
-    prompt = (
-        "You are a productivity assistant. Based on the following information, "
-        "suggest 3-5 new tasks that would be helpful.\n\n"
-    )
-    
-    if task_summary:
-        prompt += task_summary + "\n"
-    
-    if context:
-        prompt += f"Additional context: {context}\n\n"
-    
-    prompt += (
-        "Provide task suggestions as a simple list. "
-        "Each suggestion should be concise (one line per task). "
-        "Format: just the task title/description, no numbers or bullets."
-    )
-    
-    try:
-        client = OpenAI()
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=300,
-            temperature=0.7,
-        )
-        content = resp.choices[0].message.content.strip()
-        # Split by newlines and filter empty lines
-        suggestions = [line.strip() for line in content.split("\n") if line.strip()]
-        # Remove common list prefixes (numbers, bullets, dashes)
-        cleaned = []
-        for s in suggestions:
-            s = s.lstrip("0123456789.-•* ").strip()
-            if s:
-                cleaned.append(s)
-        return cleaned if cleaned else ["No suggestions generated"]
-    except Exception as e:
-        return [f"(Suggestion error: {e.__class__.__name__})"]
+    with TaskStore(store_path) as store:
+        return store.suggest(context)
+
+
+def prioritize_all(store_path: Path) -> Dict[int, int]:
+    """AI-prioritize every pending task concurrently.
+
+    Returns a mapping of task id to the new priority for each task that was
+    prioritized successfully (empty if OpenAI is unavailable).
+    """
+    with TaskStore(store_path) as store:
+        return store.prioritize_all()
+
+
+def summarize_all(store_path: Path) -> int:
+    """Generate AI summaries for all tasks that don't have one yet.
+
+    Returns the number of tasks summarized (0 if OpenAI is unavailable).
+    """
+    with TaskStore(store_path) as store:
+        return store.summarize_all()
 
 
 __all__ = [
+    "TaskStore",
     "add_task",
+    "add_tasks",
+    "get_task",
     "list_tasks",
     "complete_task",
     "delete_task",
     "search_tasks",
     "prioritize_task",
+    "prioritize_all",
+    "summarize_task",
+    "summarize_all",
     "set_priority",
     "edit_task",
     "suggest_tasks",
@@ -0,0 +1,69 @@
+"""Shared fixtures for the task manager tests."""
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from task_manager import add_tasks
+
+# tmpfs mount used for test files when present (Linux); elsewhere pytest's
+# default temp dir is kept.
+_RAM_DIR = "/dev/shm"
+_ram_basetemp = None
+
+
+def pytest_configure(config):
+    """Put tmp_path on a RAM-backed filesystem unless --basetemp was given.
+
+    Stores are real files, so mmap, shelve and os.replace behave exactly as in
+    production; they just never touch the disk.
+    """
+    global _ram_basetemp
+    if config.option.basetemp or not os.access(_RAM_DIR, os.W_OK):
+        return
+    _ram_basetemp = tempfile.mkdtemp(prefix="taskmgr-pytest-", dir=_RAM_DIR)
+    config.option.basetemp = os.path.join(_ram_basetemp, "tmp")
+
+
+def pytest_unconfigure(config):
+    if _ram_basetemp is not None:
+        shutil.rmtree(_ram_basetemp, ignore_errors=True)
+
+
+@pytest.fixture
+def temp_store(tmp_path):
+    """Path to a not-yet-created tasks.json in a per-test directory.
+
+    The AI response cache lives next to the store, so each test needs its own
+    directory rather than a shared system temp dir.
+    """
+    return tmp_path / "tasks.json"
+
+
+class TaskBuilder:
+    """Collects tasks for a test's setup and adds them with one write.
+
+    ``task_builder.add("A").add("B", priority=1).commit()`` returns the
+    created tasks in the order they were added.
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self.items = []
+
+    def add(self, title, **kwargs):
+        self.items.append({"title": title, **kwargs})
+        return self
+
+    def commit(self):
+        tasks = add_tasks(self.store_path, self.items)
+        self.items = []
+        return tasks
+
+
+@pytest.fixture
+def task_builder(temp_store):
+    """TaskBuilder writing to ``temp_store``."""
+    return TaskBuilder(temp_store)
@@ -1,47 +1,53 @@
 """Unit tests for task_manager.py AI functions using mocks."""
 
 import pytest
+import subprocess
+import sys
 from pathlib import Path
-import tempfile
-from unittest.mock import patch, MagicMock
-import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock
 
-from task_manager import add_task, prioritize_task, suggest_tasks
+import openai
 
+import _ai_cache
+import task_manager as tm
+from task_manager import (
+    add_task,
+    complete_task,
+    edit_task,
+    get_task,
+    list_tasks,
+    prioritize_task,
+    prioritize_all,
+    summarize_all,
+    suggest_tasks,
+)
 
-@pytest.fixture
-def temp_store():
-    """Create a temporary tasks.json file for testing."""
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-        temp_path = Path(f.name)
-    yield temp_path
-    # Cleanup
-    if temp_path.exists():
-        temp_path.unlink()
 
+def _resp(content):
+    """A chat completion response carrying ``content``."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
 
-@pytest.fixture
-def mock_openai_client():
-    """Mock OpenAI client for testing without real API calls."""
-    with patch('task_manager.OpenAI') as mock_client_class:
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        yield mock_client
+
+@pytest.fixture(autouse=True)
+def mock_openai(monkeypatch):
+    """Mock OpenAI client for every test, with a test API key set.
+
+    Tests configure ``mock_openai.chat.completions.create``; the sync and
+    async client classes both hand out this same mock.
+    """
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    mock_client = MagicMock()
+    monkeypatch.setattr(tm, 'OpenAI', MagicMock(return_value=mock_client))
+    monkeypatch.setattr(tm, 'AsyncOpenAI', MagicMock(return_value=mock_client))
+    return mock_client
 
 
 class TestSummarizeTask:
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_summarize_generates_summary(self, mock_openai_class, temp_store):
+    def test_summarize_generates_summary(self, mock_openai, temp_store):
         """Verify summarize flag triggers AI summary generation."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
         # Mock the response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Complete quarterly financial report by end of month"
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.chat.completions.create.return_value = _resp("Complete quarterly financial report by end of month")
         
         task = add_task(
             temp_store,
@@ -51,52 +57,12 @@ class TestSummarizeTask:
         )
         
         assert task["summary"] == "Complete quarterly financial report by end of month"
-        mock_client.chat.completions.create.assert_called_once()
+        assert mock_openai.chat.completions.create.call_count == 1
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_summarize_uses_correct_model(self, mock_openai_class, temp_store):
-        """Verify summarize uses gpt-4o-mini model."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test summary"
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        add_task(temp_store, title="Test", description="Description", summarize=True)
-        
-        call_args = mock_client.chat.completions.create.call_args
-        assert call_args.kwargs['model'] == 'gpt-4o-mini'
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_summarize_includes_title_and_description(self, mock_openai_class, temp_store):
-        """Verify summarize prompt includes title and description."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Summary"
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        add_task(
-            temp_store,
-            title="Project Setup",
-            description="Initialize repository and dependencies",
-            summarize=True
-        )
-        
-        call_args = mock_client.chat.completions.create.call_args
-        prompt = call_args.kwargs['messages'][0]['content']
-        assert "Project Setup" in prompt
-        assert "Initialize repository and dependencies" in prompt
-
-    @patch.dict(os.environ, {}, clear=True)
-    def test_summarize_without_api_key(self, temp_store):
+    def test_summarize_without_api_key(self, temp_store, monkeypatch):
         """Verify summarize fails gracefully without API key."""
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
         task = add_task(
             temp_store,
             title="Test",
@@ -106,9 +72,9 @@ class TestSummarizeTask:
         
         assert "(Summary unavailable: OpenAI API key not set)" in task["summary"]
 
-    @patch('task_manager.OpenAI', None)
-    def test_summarize_without_openai_package(self, temp_store):
+    def test_summarize_without_openai_package(self, temp_store, monkeypatch):
         """Verify summarize fails gracefully without openai package."""
+        monkeypatch.setattr(tm, 'OpenAI', None)
         task = add_task(
             temp_store,
             title="Test",
@@ -118,118 +84,142 @@ class TestSummarizeTask:
         
         assert "(Summary unavailable: OpenAI API key not set)" in task["summary"]
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_summarize_handles_api_error(self, mock_openai_class, temp_store):
+    def test_summarize_handles_api_error(self, mock_openai, temp_store):
         """Verify summarize handles API errors gracefully."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.side_effect = Exception("API Error")
+        mock_openai.chat.completions.create.side_effect = Exception("API Error")
         
         task = add_task(temp_store, title="Test", description="Desc", summarize=True)
         
         assert "(Summary error:" in task["summary"]
 
 
-class TestPrioritizeTask:
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_prioritize_sets_priority(self, mock_openai_class, temp_store):
-        """Verify prioritize_task sets priority based on AI response."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+class TestAICache:
+    def test_identical_summary_served_from_cache(self, mock_openai, temp_store):
+        """Verify a repeated title/description pair doesn't hit the API again."""
+        mock_openai.chat.completions.create.return_value = _resp("Cached summary")
         
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Priority: 1\nReason: Urgent deadline approaching"
-        mock_client.chat.completions.create.return_value = mock_response
+        first = add_task(temp_store, title="Same", description="Text", summarize=True)
+        second = add_task(temp_store, title="Same", description="Text", summarize=True)
         
-        task = add_task(temp_store, title="Critical Bug Fix", priority=3)
-        priority = prioritize_task(temp_store, task["id"])
+        assert first["summary"] == second["summary"] == "Cached summary"
+        assert mock_openai.chat.completions.create.call_count == 1
+
+    def test_prioritize_served_from_cache(self, mock_openai, temp_store):
+        """Verify re-prioritizing an unchanged task reuses the cached response."""
+        mock_openai.chat.completions.create.return_value = _resp("Priority: 2\nReason: Cached")
         
-        assert priority == 1
+        task = add_task(temp_store, title="Task")
+        assert prioritize_task(temp_store, task["id"]) == 2
+        assert prioritize_task(temp_store, task["id"]) == 2
+        assert mock_openai.chat.completions.create.call_count == 1
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_prioritize_uses_correct_model(self, mock_openai_class, temp_store):
-        """Verify prioritize uses gpt-4o-mini model."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+    def test_errors_are_not_cached(self, mock_openai, temp_store):
+        """Verify a failed request is retried on the next call."""
+        mock_openai.chat.completions.create.side_effect = ValueError("API Error")
         
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Priority: 2\nReason: Important task"
-        mock_client.chat.completions.create.return_value = mock_response
+        add_task(temp_store, title="Task", description="Desc", summarize=True)
+        add_task(temp_store, title="Task", description="Desc", summarize=True)
         
-        task = add_task(temp_store, title="Test Task")
-        prioritize_task(temp_store, task["id"])
+        assert mock_openai.chat.completions.create.call_count == 2
+
+    def test_edit_invalidates_cached_summary(self, mock_openai, temp_store):
+        """Verify editing the text drops the summary cached for the old text."""
+        mock_openai.chat.completions.create.return_value = _resp("Old summary")
         
-        call_args = mock_client.chat.completions.create.call_args
-        assert call_args.kwargs['model'] == 'gpt-4o-mini'
+        task = add_task(temp_store, title="Old", description="Text", summarize=True)
+        key = _ai_cache.cache_key("gpt-4o-mini", mock_openai.chat.completions.create.call_args.kwargs['messages'][0]['content'])
+        assert _ai_cache.get(temp_store, key) == "Old summary"
+        
+        edit_task(temp_store, task["id"], title="New")
+        
+        assert _ai_cache.get(temp_store, key) is None
+
+
+@pytest.fixture
+def mock_sleep(monkeypatch):
+    """Replace the retry backoff sleep with a recording no-op."""
+    sleep = MagicMock()
+    monkeypatch.setattr(tm.time, 'sleep', sleep)
+    return sleep
+
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_prioritize_includes_task_context(self, mock_openai_class, temp_store):
-        """Verify prioritize includes task details in prompt."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+class TestRetry:
+    def test_retries_transient_errors(self, mock_sleep, mock_openai, temp_store):
+        """Verify rate limits/connection drops are retried with backoff."""
+        mock_response = _resp("Recovered summary")
+        connection_error = openai.APIConnectionError(request=MagicMock())
+        mock_openai.chat.completions.create.side_effect = [connection_error, connection_error, mock_response]
         
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Priority: 2\nReason: Moderate urgency"
-        mock_client.chat.completions.create.return_value = mock_response
+        task = add_task(temp_store, title="Test", description="Desc", summarize=True)
         
-        task = add_task(
-            temp_store,
-            title="Submit Report",
-            description="Quarterly analysis",
-            due_date="2025-11-30"
+        assert task["summary"] == "Recovered summary"
+        assert mock_openai.chat.completions.create.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    def test_gives_up_after_three_attempts(self, mock_sleep, mock_openai, temp_store):
+        """Verify persistent transient errors surface after the last attempt."""
+        mock_openai.chat.completions.create.side_effect = openai.APITimeoutError(
+            request=MagicMock()
         )
-        prioritize_task(temp_store, task["id"])
         
-        call_args = mock_client.chat.completions.create.call_args
-        prompt = call_args.kwargs['messages'][0]['content']
-        assert "Submit Report" in prompt
-        assert "Quarterly analysis" in prompt
-        assert "2025-11-30" in prompt
+        task = add_task(temp_store, title="Test", description="Desc", summarize=True)
+        
+        assert "(Summary error: APITimeoutError)" == task["summary"]
+        assert mock_openai.chat.completions.create.call_count == 3
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_prioritize_defaults_to_3_on_invalid_response(self, mock_openai_class, temp_store):
-        """Verify prioritize defaults to 3 if AI returns invalid priority."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
+    def test_does_not_retry_other_errors(self, mock_sleep, mock_openai, temp_store):
+        """Verify non-transient errors fail immediately."""
+        mock_openai.chat.completions.create.side_effect = ValueError("Bad request")
         
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Priority: invalid\nReason: Something"
-        mock_client.chat.completions.create.return_value = mock_response
+        suggest_tasks(temp_store)
+        
+        assert mock_openai.chat.completions.create.call_count == 1
+        assert mock_sleep.call_count == 0
+
+
+class TestPrioritizeTask:
+    def test_prioritize_sets_priority(self, mock_openai, temp_store):
+        """Verify prioritize_task sets priority based on AI response."""
+        mock_openai.chat.completions.create.return_value = _resp("Priority: 1\nReason: Urgent deadline approaching")
+        
+        task = add_task(temp_store, title="Critical Bug Fix", priority=3)
+        priority = prioritize_task(temp_store, task["id"])
+        
+        assert priority == 1
+
+
+    def test_prioritize_defaults_to_3_on_invalid_response(self, mock_openai, temp_store):
+        """Verify prioritize defaults to 3 if AI returns invalid priority."""
+        mock_openai.chat.completions.create.return_value = _resp("Priority: invalid\nReason: Something")
         
         task = add_task(temp_store, title="Task")
         priority = prioritize_task(temp_store, task["id"])
         
         assert priority == 3
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_prioritize_clamps_out_of_range_priority(self, mock_openai_class, temp_store):
+    def test_prioritize_clamps_out_of_range_priority(self, mock_openai, temp_store):
         """Verify prioritize clamps priority to 1-5 range."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Priority: 10\nReason: Very important"
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.chat.completions.create.return_value = _resp("Priority: 10\nReason: Very important")
         
         task = add_task(temp_store, title="Task")
         priority = prioritize_task(temp_store, task["id"])
         
         assert priority == 3  # Should default to 3
 
-    @patch.dict(os.environ, {}, clear=True)
-    def test_prioritize_without_api_key(self, temp_store):
+    @pytest.mark.parametrize("content,expected", [
+        ("Priority: 1\nReason: Urgent", (1, "Urgent")),
+        ("Priority: 4\r\nReason: Windows line endings\r\n", (4, "Windows line endings")),
+        ("Some preamble\nPriority: 2\nReason: Later line", (2, "Later line")),
+        ("Priority: 2 (high)", (3, "")),
+        ("No structured answer", (3, "")),
+    ])
+    def test_parse_priority_response(self, content, expected):
+        """Verify priority/reason parsing of the model's reply."""
+        assert tm._parse_priority(content) == expected
+
+    def test_prioritize_without_api_key(self, temp_store, monkeypatch):
         """Verify prioritize returns None without API key."""
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
         task = add_task(temp_store, title="Test")
         priority = prioritize_task(temp_store, task["id"])
         
@@ -240,13 +230,9 @@ class TestPrioritizeTask:
         priority = prioritize_task(temp_store, 999)
         assert priority is None
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_prioritize_handles_api_error(self, mock_openai_class, temp_store, capsys):
+    def test_prioritize_handles_api_error(self, mock_openai, temp_store, capsys):
         """Verify prioritize handles API errors gracefully."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.side_effect = RuntimeError("API Error")
+        mock_openai.chat.completions.create.side_effect = RuntimeError("API Error")
         
         task = add_task(temp_store, title="Test")
         priority = prioritize_task(temp_store, task["id"])
@@ -257,91 +243,20 @@ class TestPrioritizeTask:
 
 
 class TestSuggestTasks:
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_suggest_returns_list(self, mock_openai_class, temp_store):
+    def test_suggest_returns_list(self, mock_openai, temp_store):
         """Verify suggest_tasks returns a list of suggestions."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "1. Review code\n2. Write tests\n3. Update docs"
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.chat.completions.create.return_value = _resp("1. Review code\n2. Write tests\n3. Update docs")
         
         suggestions = suggest_tasks(temp_store)
         
         assert isinstance(suggestions, list)
         assert len(suggestions) > 0
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_suggest_uses_correct_model(self, mock_openai_class, temp_store):
-        """Verify suggest uses gpt-4o-mini model."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Task 1\nTask 2"
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        suggest_tasks(temp_store)
-        
-        call_args = mock_client.chat.completions.create.call_args
-        assert call_args.kwargs['model'] == 'gpt-4o-mini'
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_suggest_includes_pending_tasks(self, mock_openai_class, temp_store):
-        """Verify suggest includes existing pending tasks in context."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "New task 1\nNew task 2"
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        add_task(temp_store, title="Existing Task 1", description="Some work")
-        add_task(temp_store, title="Existing Task 2", description="More work")
-        
-        suggest_tasks(temp_store)
-        
-        call_args = mock_client.chat.completions.create.call_args
-        prompt = call_args.kwargs['messages'][0]['content']
-        assert "Existing Task 1" in prompt
-        assert "Existing Task 2" in prompt
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_suggest_includes_context(self, mock_openai_class, temp_store):
-        """Verify suggest includes user-provided context."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Prepare presentation\nReview slides"
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        suggest_tasks(temp_store, context="work project deadline next week")
-        
-        call_args = mock_client.chat.completions.create.call_args
-        prompt = call_args.kwargs['messages'][0]['content']
-        assert "work project deadline next week" in prompt
-
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_suggest_cleans_list_prefixes(self, mock_openai_class, temp_store):
+    def test_suggest_cleans_list_prefixes(self, mock_openai, temp_store):
         """Verify suggest removes common list prefixes from suggestions."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "1. Review code\n2. Write tests\n- Update docs"
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.chat.completions.create.return_value = _resp("1. Review code\n2. Write tests\n- Update docs")
         
         suggestions = suggest_tasks(temp_store)
         
@@ -351,48 +266,174 @@ class TestSuggestTasks:
         # Should not have prefixes
         assert not any(s.startswith("1.") or s.startswith("2.") or s.startswith("-") for s in suggestions)
 
-    @patch.dict(os.environ, {}, clear=True)
-    def test_suggest_without_api_key(self, temp_store):
+    def test_suggest_without_api_key(self, temp_store, monkeypatch):
         """Verify suggest returns error message without API key."""
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
         suggestions = suggest_tasks(temp_store)
         
         assert len(suggestions) == 1
         assert "unavailable" in suggestions[0].lower()
 
-    @patch('task_manager.OpenAI', None)
-    def test_suggest_without_openai_package(self, temp_store):
+    def test_suggest_without_openai_package(self, temp_store, monkeypatch):
         """Verify suggest returns error message without openai package."""
+        monkeypatch.setattr(tm, 'OpenAI', None)
         suggestions = suggest_tasks(temp_store)
         
         assert len(suggestions) == 1
         assert "unavailable" in suggestions[0].lower()
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_suggest_handles_api_error(self, mock_openai_class, temp_store):
+    def test_suggest_handles_api_error(self, mock_openai, temp_store):
         """Verify suggest handles API errors gracefully."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        mock_client.chat.completions.create.side_effect = ValueError("API Error")
+        mock_openai.chat.completions.create.side_effect = ValueError("API Error")
         
         suggestions = suggest_tasks(temp_store)
         
         assert len(suggestions) == 1
         assert "error" in suggestions[0].lower()
 
-    @patch('task_manager.OpenAI')
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-key'})
-    def test_suggest_filters_empty_lines(self, mock_openai_class, temp_store):
+    def test_suggest_filters_empty_lines(self, mock_openai, temp_store):
         """Verify suggest filters out empty lines from response."""
-        mock_client = MagicMock()
-        mock_openai_class.return_value = mock_client
-        
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Task 1\n\n\nTask 2\n\nTask 3"
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.chat.completions.create.return_value = _resp("Task 1\n\n\nTask 2\n\nTask 3")
         
         suggestions = suggest_tasks(temp_store)
         
         assert len(suggestions) == 3
         assert all(s.strip() for s in suggestions)  # No empty strings
+
+
+def _summarize(store):
+    add_task(
+        store,
+        title="Project Setup",
+        description="Initialize repository and dependencies",
+        summarize=True
+    )
+
+
+def _prioritize(store):
+    task = add_task(
+        store,
+        title="Submit Report",
+        description="Quarterly analysis",
+        due_date="2025-11-30"
+    )
+    prioritize_task(store, task["id"])
+
+
+def _suggest(store):
+    add_task(store, title="Existing Task 1", description="Some work")
+    add_task(store, title="Existing Task 2", description="More work")
+    suggest_tasks(store, context="work project deadline next week")
+
+
+# Each AI entry point and the text its prompt must carry
+AI_ACTIONS = [
+    pytest.param(
+        _summarize,
+        ["Project Setup", "Initialize repository and dependencies"],
+        id="summarize",
+    ),
+    pytest.param(
+        _prioritize,
+        ["Submit Report", "Quarterly analysis", "2025-11-30"],
+        id="prioritize",
+    ),
+    pytest.param(
+        _suggest,
+        ["Existing Task 1", "Existing Task 2", "work project deadline next week"],
+        id="suggest",
+    ),
+]
+
+
+class TestAIRequests:
+    @pytest.mark.parametrize(
+        "action",
+        [_summarize, _prioritize, _suggest],
+        ids=["summarize", "prioritize", "suggest"],
+    )
+    def test_uses_correct_model(self, mock_openai, temp_store, action):
+        """Verify every AI feature uses the gpt-4o-mini model."""
+        mock_openai.chat.completions.create.return_value = _resp("Priority: 2\nReason: Important task")
+        
+        action(temp_store)
+        
+        call_args = mock_openai.chat.completions.create.call_args
+        assert call_args.kwargs['model'] == 'gpt-4o-mini'
+
+    @pytest.mark.parametrize("action,expected", AI_ACTIONS)
+    def test_prompt_includes_task_context(self, mock_openai, temp_store, action, expected):
+        """Verify the prompt carries the task details and user context."""
+        mock_openai.chat.completions.create.return_value = _resp("Priority: 2\nReason: Moderate urgency")
+        
+        action(temp_store)
+        
+        prompt = mock_openai.chat.completions.create.call_args.kwargs['messages'][0]['content']
+        for text in expected:
+            assert text in prompt
+
+
+class TestBatchedAI:
+    def test_prioritize_all_updates_pending_tasks(self, mock_openai, temp_store):
+        """Verify prioritize_all prioritizes every pending task in one batch."""
+        mock_openai.chat.completions.create = AsyncMock(return_value=_resp("Priority: 1\nReason: Urgent"))
+        
+        t1 = add_task(temp_store, title="Task 1", priority=4)
+        t2 = add_task(temp_store, title="Task 2", priority=5)
+        done = add_task(temp_store, title="Done", priority=5)
+        complete_task(temp_store, done["id"])
+        
+        results = prioritize_all(temp_store)
+        
+        assert results == {t1["id"]: 1, t2["id"]: 1}
+        assert mock_openai.chat.completions.create.await_count == 2
+        priorities = {t["id"]: t["priority"] for t in list_tasks(temp_store)}
+        assert priorities == {t1["id"]: 1, t2["id"]: 1, done["id"]: 5}
+
+    def test_prioritize_all_skips_failed_requests(self, mock_openai, temp_store, capsys):
+        """Verify a failed request leaves its task untouched."""
+        mock_openai.chat.completions.create = AsyncMock(side_effect=RuntimeError("API Error"))
+        
+        task = add_task(temp_store, title="Task", priority=4)
+        results = prioritize_all(temp_store)
+        
+        assert results == {}
+        assert get_task(temp_store, task["id"])["priority"] == 4
+        assert "(Prioritization error" in capsys.readouterr().out
+
+    def test_summarize_all_fills_missing_summaries(self, mock_openai, temp_store):
+        """Verify summarize_all only summarizes tasks without a summary."""
+        mock_openai.chat.completions.create = AsyncMock(return_value=_resp("Batch summary"))
+        
+        add_task(temp_store, title="Task 1", description="First")
+        add_task(temp_store, title="Task 2", description="Second")
+        
+        assert summarize_all(temp_store) == 2
+        assert all(t["summary"] == "Batch summary" for t in list_tasks(temp_store))
+        # Nothing left to summarize on a second run
+        assert summarize_all(temp_store) == 0
+        assert mock_openai.chat.completions.create.await_count == 2
+
+    def test_batched_without_api_key(self, temp_store, monkeypatch):
+        """Verify batched helpers are no-ops without API key."""
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+        add_task(temp_store, title="Task")
+        assert prioritize_all(temp_store) == {}
+        assert summarize_all(temp_store) == 0
+
+
+class TestLazyImports:
+    def test_importing_task_manager_skips_ai_dependencies(self):
+        """Verify openai/asyncio/shelve are not imported until an AI feature runs."""
+        code = (
+            "import sys, task_manager; "
+            "print(sorted(m for m in ('openai', 'asyncio', '_ai_cache', 'shelve') if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(tm.__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        assert out.strip() == "[]"
@@ -1,13 +1,13 @@
 """Unit tests for task_manager.py core functions."""
 
 import pytest
-from pathlib import Path
 import json
-import tempfile
-from datetime import datetime
 
+import task_manager
 from task_manager import (
     add_task,
+    add_tasks,
+    get_task,
     list_tasks,
     complete_task,
     delete_task,
@@ -15,20 +15,11 @@ from task_manager import (
     set_priority,
     clear_tasks,
     search_tasks,
+    get_overview,
+    TaskStore,
 )
 
 
-@pytest.fixture
-def temp_store():
-    """Create a temporary tasks.json file for testing."""
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-        temp_path = Path(f.name)
-    yield temp_path
-    # Cleanup
-    if temp_path.exists():
-        temp_path.unlink()
-
-
 class TestAddTask:
     def test_add_basic_task(self, temp_store):
         task = add_task(temp_store, title="Test Task", description="Test description")
@@ -63,57 +54,108 @@ class TestAddTask:
         assert task3["id"] == 3
 
 
+    def test_add_after_deleting_newest_reuses_id(self, temp_store):
+        add_task(temp_store, title="First")
+        second = add_task(temp_store, title="Second")
+        delete_task(temp_store, second["id"])
+        assert add_task(temp_store, title="Replacement")["id"] == second["id"]
+
+    def test_add_after_deleting_older_task_keeps_counting(self, temp_store):
+        first = add_task(temp_store, title="First")
+        add_task(temp_store, title="Second")
+        delete_task(temp_store, first["id"])
+        assert add_task(temp_store, title="Third")["id"] == 3
+
+
+class TestAddTasks:
+    def test_add_tasks_assigns_sequential_ids(self, temp_store):
+        add_task(temp_store, title="Existing")
+        tasks = add_tasks(temp_store, [{"title": "A", "priority": 1}, {"title": "B", "due_date": "2025-12-31"}])
+        
+        assert [t["id"] for t in tasks] == [2, 3]
+        assert tasks[0]["priority"] == 1
+        assert tasks[1]["due_date"] == "2025-12-31"
+        assert len(list_tasks(temp_store)) == 3
+
+    def test_add_tasks_writes_once(self, temp_store, monkeypatch):
+        saves = []
+        real_save = task_manager._save
+        monkeypatch.setattr(task_manager, "_save", lambda p, t: saves.append(p) or real_save(p, t))
+        
+        add_tasks(temp_store, [{"title": f"Task {i}"} for i in range(5)])
+        
+        assert len(saves) == 1
+
+
 class TestListTasks:
     def test_list_empty_store(self, temp_store):
         tasks = list_tasks(temp_store)
         assert tasks == []
 
-    def test_list_all_tasks(self, temp_store):
-        add_task(temp_store, title="Task 1")
-        add_task(temp_store, title="Task 2")
-        add_task(temp_store, title="Task 3")
+    def test_list_all_tasks(self, temp_store, task_builder):
+        task_builder.add("Task 1").add("Task 2").add("Task 3").commit()
         tasks = list_tasks(temp_store, filter_mode="all")
         assert len(tasks) == 3
 
-    def test_list_pending_tasks(self, temp_store):
-        add_task(temp_store, title="Task 1")
-        task2 = add_task(temp_store, title="Task 2")
-        add_task(temp_store, title="Task 3")
+    def test_list_pending_tasks(self, temp_store, task_builder):
+        _, task2, _ = task_builder.add("Task 1").add("Task 2").add("Task 3").commit()
         complete_task(temp_store, task2["id"])
         
         pending = list_tasks(temp_store, filter_mode="pending")
         assert len(pending) == 2
 
-    def test_list_completed_tasks(self, temp_store):
-        task1 = add_task(temp_store, title="Task 1")
-        add_task(temp_store, title="Task 2")
-        task3 = add_task(temp_store, title="Task 3")
+    def test_list_completed_tasks(self, temp_store, task_builder):
+        task1, _, task3 = task_builder.add("Task 1").add("Task 2").add("Task 3").commit()
         complete_task(temp_store, task1["id"])
         complete_task(temp_store, task3["id"])
         
         completed = list_tasks(temp_store, filter_mode="completed")
         assert len(completed) == 2
 
-    def test_list_sorted_by_priority(self, temp_store):
-        add_task(temp_store, title="Low", priority=5)
-        add_task(temp_store, title="High", priority=1)
-        add_task(temp_store, title="Medium", priority=3)
+    def test_list_sorted_by_priority(self, temp_store, task_builder):
+        (task_builder
+            .add("Low", priority=5)
+            .add("High", priority=1)
+            .add("Medium", priority=3)
+            .commit())
         
         tasks = list_tasks(temp_store, sort_mode="priority")
         assert tasks[0]["priority"] == 1
         assert tasks[1]["priority"] == 3
         assert tasks[2]["priority"] == 5
 
-    def test_list_sorted_by_due_date(self, temp_store):
-        add_task(temp_store, title="Later", due_date="2025-12-31")
-        add_task(temp_store, title="Sooner", due_date="2025-11-30")
-        add_task(temp_store, title="Middle", due_date="2025-12-15")
+    def test_list_sorted_by_due_date(self, temp_store, task_builder):
+        (task_builder
+            .add("Later", due_date="2025-12-31")
+            .add("Sooner", due_date="2025-11-30")
+            .add("Middle", due_date="2025-12-15")
+            .commit())
         
         tasks = list_tasks(temp_store, sort_mode="due")
         assert tasks[0]["due_date"] == "2025-11-30"
         assert tasks[1]["due_date"] == "2025-12-15"
         assert tasks[2]["due_date"] == "2025-12-31"
 
+    def test_list_limit_returns_top_k(self, temp_store):
+        add_tasks(temp_store, [{"title": f"P{p}", "priority": p} for p in (5, 1, 3, 2, 4)])
+        
+        tasks = list_tasks(temp_store, sort_mode="priority", limit=2)
+        assert [t["priority"] for t in tasks] == [1, 2]
+        # A limit at or above the task count behaves like no limit
+        assert len(list_tasks(temp_store, limit=10)) == 5
+
+
+class TestGetTask:
+    def test_get_existing_task(self, temp_store, task_builder):
+        _, second = task_builder.add("First").add("Second", priority=2).commit()
+        stored = get_task(temp_store, second["id"])
+        assert stored["title"] == "Second"
+        assert stored["priority"] == 2
+
+    def test_get_nonexistent_task(self, temp_store):
+        add_task(temp_store, title="Task")
+        assert get_task(temp_store, 999) is None
+
 
 class TestCompleteTask:
     def test_complete_existing_task(self, temp_store):
@@ -121,8 +163,8 @@ class TestCompleteTask:
         result = complete_task(temp_store, task["id"])
         assert result is True
         
-        tasks = list_tasks(temp_store)
-        assert tasks[0]["status"] == "complete"
+        stored = get_task(temp_store, task["id"])
+        assert stored["status"] == "complete"
 
     def test_complete_nonexistent_task(self, temp_store):
         result = complete_task(temp_store, 999)
@@ -148,10 +190,8 @@ class TestDeleteTask:
         result = delete_task(temp_store, 999)
         assert result is False
 
-    def test_delete_from_multiple_tasks(self, temp_store):
-        task1 = add_task(temp_store, title="Keep 1")
-        task2 = add_task(temp_store, title="Delete")
-        task3 = add_task(temp_store, title="Keep 2")
+    def test_delete_from_multiple_tasks(self, temp_store, task_builder):
+        _, task2, _ = task_builder.add("Keep 1").add("Delete").add("Keep 2").commit()
         
         delete_task(temp_store, task2["id"])
         tasks = list_tasks(temp_store)
@@ -166,31 +206,31 @@ class TestEditTask:
         result = edit_task(temp_store, task["id"], title="Updated")
         assert result is True
         
-        tasks = list_tasks(temp_store)
-        assert tasks[0]["title"] == "Updated"
+        stored = get_task(temp_store, task["id"])
+        assert stored["title"] == "Updated"
 
     def test_edit_description(self, temp_store):
         task = add_task(temp_store, title="Task", description="Old desc")
         edit_task(temp_store, task["id"], description="New desc")
         
-        tasks = list_tasks(temp_store)
-        assert tasks[0]["description"] == "New desc"
+        stored = get_task(temp_store, task["id"])
+        assert stored["description"] == "New desc"
 
     def test_edit_due_date(self, temp_store):
         task = add_task(temp_store, title="Task", due_date="2025-12-01")
         edit_task(temp_store, task["id"], due_date="2025-12-31")
         
-        tasks = list_tasks(temp_store)
-        assert tasks[0]["due_date"] == "2025-12-31"
+        stored = get_task(temp_store, task["id"])
+        assert stored["due_date"] == "2025-12-31"
 
     def test_edit_multiple_fields(self, temp_store):
         task = add_task(temp_store, title="Original", description="Old", due_date="2025-12-01")
         edit_task(temp_store, task["id"], title="New", description="Updated", due_date="2025-12-31")
         
-        tasks = list_tasks(temp_store)
-        assert tasks[0]["title"] == "New"
-        assert tasks[0]["description"] == "Updated"
-        assert tasks[0]["due_date"] == "2025-12-31"
+        stored = get_task(temp_store, task["id"])
+        assert stored["title"] == "New"
+        assert stored["description"] == "Updated"
+        assert stored["due_date"] == "2025-12-31"
 
     def test_edit_nonexistent_task(self, temp_store):
         result = edit_task(temp_store, 999, title="Nope")
@@ -200,8 +240,8 @@ class TestEditTask:
         task = add_task(temp_store, title="Task", due_date="2025-12-01")
         edit_task(temp_store, task["id"], due_date="invalid")
         
-        tasks = list_tasks(temp_store)
-        assert tasks[0]["due_date"] == "2025-12-01"  # Should keep original
+        stored = get_task(temp_store, task["id"])
+        assert stored["due_date"] == "2025-12-01"  # Should keep original
 
 
 class TestSetPriority:
@@ -210,12 +250,12 @@ class TestSetPriority:
         result = set_priority(temp_store, task["id"], 1)
         assert result is True
         
-        tasks = list_tasks(temp_store)
-        assert tasks[0]["priority"] == 1
+        stored = get_task(temp_store, task["id"])
+        assert stored["priority"] == 1
 
     def test_set_priority_range(self, temp_store):
-        for p in range(1, 6):
-            task = add_task(temp_store, title=f"Priority {p}")
+        tasks = add_tasks(temp_store, [{"title": f"Priority {p}"} for p in range(1, 6)])
+        for p, task in enumerate(tasks, 1):
             set_priority(temp_store, task["id"], p)
         
         tasks = list_tasks(temp_store, sort_mode="priority")
@@ -242,10 +282,8 @@ class TestClearTasks:
         count = clear_tasks(temp_store)
         assert count == 0
 
-    def test_clear_with_tasks(self, temp_store):
-        add_task(temp_store, title="Task 1")
-        add_task(temp_store, title="Task 2")
-        add_task(temp_store, title="Task 3")
+    def test_clear_with_tasks(self, temp_store, task_builder):
+        task_builder.add("Task 1").add("Task 2").add("Task 3").commit()
         
         count = clear_tasks(temp_store)
         assert count == 3
@@ -263,31 +301,88 @@ class TestClearTasks:
             data = json.load(f)
         assert data == []
 
-    def test_clear_then_add(self, temp_store):
-        add_task(temp_store, title="Task 1")
-        add_task(temp_store, title="Task 2")
+    def test_clear_then_add(self, temp_store, task_builder):
+        task_builder.add("Task 1").add("Task 2").commit()
         clear_tasks(temp_store)
         
         new_task = add_task(temp_store, title="New Task")
         assert new_task["id"] == 1  # ID should reset to 1
 
 
+class TestOverview:
+    def test_overview_counts(self, temp_store):
+        add_task(temp_store, title="Overdue high", priority=1, due_date="2000-01-01")
+        add_task(temp_store, title="Future", priority=4, due_date="2999-12-31")
+        done = add_task(temp_store, title="Done overdue", priority=1, due_date="2000-01-01")
+        complete_task(temp_store, done["id"])
+        
+        assert get_overview(temp_store) == {
+            "total": 3,
+            "incomplete": 2,
+            "high_priority": 1,
+            "overdue": 1,
+        }
+
+    def test_overview_ignores_malformed_due_dates(self, temp_store):
+        temp_store.write_text(json.dumps([
+            {"id": 1, "title": "Bad", "status": "pending", "priority": 3, "due_date": "2000-1-1"},
+        ]))
+        assert get_overview(temp_store)["overdue"] == 0
+
+    def test_overview_counts_mixed_tasks(self, temp_store, monkeypatch):
+        # Dates with other separators compare as text, sorting after "2026-10-15"
+        monkeypatch.setattr(task_manager, "_today", lambda: "2026-10-15")
+        temp_store.write_text(json.dumps([
+            {"id": 1, "title": "a", "status": "pending", "priority": 1, "due_date": "2000-01-01"},
+            {"id": 2, "title": "b", "status": "pending", "priority": 4, "due_date": "2999-12-31"},
+            {"id": 3, "title": "c", "status": "complete", "priority": 1, "due_date": "2000-01-01"},
+            {"id": 4, "title": "d", "status": "pending", "priority": 2, "due_date": None},
+            {"id": 5, "title": "e", "status": "pending", "priority": 3, "due_date": "2000-1-1"},
+            {"id": 6, "title": "f", "status": "pending", "priority": 3, "due_date": "1999-ab-cd"},
+            {"id": 7, "title": "g", "status": "pending", "priority": 3, "due_date": "2026/09/01"},
+            {"id": 8, "title": "h", "status": "pending", "priority": 3, "due_date": "2026x01x01"},
+        ]))
+        with TaskStore(temp_store) as store:
+            assert store.overview() == {
+                "total": 8,
+                "incomplete": 7,
+                "high_priority": 2,
+                "overdue": 2,
+            }
+            store.complete(1)
+            assert store.overview()["overdue"] == 1
+
+    def test_today_is_cached_until_midnight(self, monkeypatch):
+        midnight = 1767225600.0  # 2026-01-01T00:00:00Z
+        monkeypatch.setattr(task_manager, "_today_until", 0.0)
+        clock = iter([midnight - 2, midnight - 1, midnight])
+        monkeypatch.setattr(task_manager.time, "time", lambda: next(clock))
+        
+        assert task_manager._today() == "2025-12-31"
+        assert task_manager._today() == "2025-12-31"
+        assert task_manager._today() == "2026-01-01"
+
+
 class TestSearchTasks:
-    def test_search_prefix_priority(self, temp_store):
-        t1 = add_task(temp_store, title="Brush teeth")
-        t2 = add_task(temp_store, title="Do laundry", description="Buy bleach and detergent")
-        t3 = add_task(temp_store, title="Buy groceries")
-        t4 = add_task(temp_store, title="Remember birthday")
+    def test_search_prefix_priority(self, temp_store, task_builder):
+        t1, t2, t3, t4 = (task_builder
+            .add("Brush teeth")
+            .add("Do laundry", description="Buy bleach and detergent")
+            .add("Buy groceries")
+            .add("Remember birthday")
+            .commit())
 
         results = search_tasks(temp_store, "b")
         ids = [r["id"] for r in results]
         # Prefix matches (titles starting with 'b'): t1, t3 appear first, then other substring matches t2, t4
         assert ids == [t1["id"], t3["id"], t2["id"], t4["id"]]
 
-    def test_search_incremental_prefix(self, temp_store):
-        t1 = add_task(temp_store, title="Brush teeth")
-        t2 = add_task(temp_store, title="Do laundry", description="Need brown bags")
-        t3 = add_task(temp_store, title="Broken screen repair")
+    def test_search_incremental_prefix(self, temp_store, task_builder):
+        (task_builder
+            .add("Brush teeth")
+            .add("Do laundry", description="Need brown bags")
+            .add("Broken screen repair")
+            .commit())
 
         results_br = search_tasks(temp_store, "br")
         titles_br = [r["title"].lower() for r in results_br]
@@ -296,17 +391,131 @@ class TestSearchTasks:
         # Ensure prefix match count is correct (Brush teeth, Broken screen repair)
         assert set(titles_br[:2]) == {"brush teeth", "broken screen repair"}
 
-    def test_search_substring_only(self, temp_store):
-        add_task(temp_store, title="Alpha task")
-        add_task(temp_store, title="Gamma work", description="Contains the term milk here")
-        add_task(temp_store, title="Delta")
+    def test_search_substring_only(self, temp_store, task_builder):
+        (task_builder
+            .add("Alpha task")
+            .add("Gamma work", description="Contains the term milk here")
+            .add("Delta")
+            .commit())
         results = search_tasks(temp_store, "milk")
         assert len(results) == 1
         assert "milk" in results[0]["description"].lower()
 
-    def test_search_case_insensitive(self, temp_store):
-        add_task(temp_store, title="Brush teeth")
-        add_task(temp_store, title="Buy milk")
+    def test_search_case_insensitive(self, temp_store, task_builder):
+        task_builder.add("Brush teeth").add("Buy milk").commit()
         r_lower = search_tasks(temp_store, "b")
         r_upper = search_tasks(temp_store, "B")
         assert [t["id"] for t in r_lower] == [t["id"] for t in r_upper]
+
+
+class TestTaskStore:
+    def test_batched_operations_write_once_on_exit(self, temp_store):
+        with TaskStore(temp_store) as store:
+            task = store.add("First")
+            store.add("Second")
+            store.complete(task["id"])
+            # Nothing is written until the store is closed
+            assert list_tasks(temp_store) == []
+        
+        tasks = list_tasks(temp_store, sort_mode="priority")
+        assert [t["title"] for t in tasks] == ["First", "Second"]
+        assert tasks[0]["status"] == "complete"
+
+    def test_reloads_when_file_changes(self, temp_store):
+        add_task(temp_store, title="Existing")
+        with TaskStore(temp_store) as store:
+            assert len(store.list()) == 1
+            add_task(temp_store, title="Added elsewhere")
+            store._load_if_stale()
+            assert len(store.list()) == 2
+
+    def test_search_index_tracks_mutations(self, temp_store):
+        with TaskStore(temp_store) as store:
+            keep = store.add("Buy milk")
+            assert [t["id"] for t in store.search("milk")] == [keep["id"]]
+            
+            other = store.add("Oat milk", description="for coffee")
+            assert [t["id"] for t in store.search("milk")] == [keep["id"], other["id"]]
+            
+            store.edit(keep["id"], title="Buy bread")
+            assert [t["id"] for t in store.search("milk")] == [other["id"]]
+            assert [t["id"] for t in store.search("for cof")] == [other["id"]]
+            
+            store.delete(other["id"])
+            assert store.search("milk") == []
+
+    def test_read_only_use_does_not_rewrite(self, temp_store):
+        add_task(temp_store, title="Task")
+        before = temp_store.stat().st_mtime_ns
+        with TaskStore(temp_store) as store:
+            store.list()
+            store.search("task")
+        assert temp_store.stat().st_mtime_ns == before
+
+    def test_no_op_mutations_do_not_rewrite(self, temp_store):
+        task = add_task(temp_store, title="Task", due_date="2025-12-31", priority=2)
+        complete_task(temp_store, task["id"])
+        before = temp_store.stat().st_mtime_ns
+        with TaskStore(temp_store) as store:
+            assert store.complete(task["id"])
+            assert store.set_priority(task["id"], 2)
+            assert store.edit(task["id"], title="Task", due_date="2025-12-31")
+            assert not store._dirty
+        assert temp_store.stat().st_mtime_ns == before
+
+    def test_search_index_shared_while_file_unchanged(self, temp_store):
+        add_task(temp_store, title="Buy milk")
+        with TaskStore(temp_store) as first:
+            first.search("milk")
+        with TaskStore(temp_store) as second:
+            assert len(second.search("milk")) == 1
+        # The second store reused the lowercased text instead of rebuilding it
+        assert second._lowered is first._lowered
+        
+        add_task(temp_store, title="Oat milk")
+        with TaskStore(temp_store) as third:
+            assert len(third.search("milk")) == 2
+        assert third._lowered is not first._lowered
+
+    def test_cached_sort_order_tracks_changes(self, temp_store, task_builder):
+        task_builder.add("Low", priority=5).add("High", priority=1).commit()
+        assert [t["title"] for t in list_tasks(temp_store)] == ["High", "Low"]
+        
+        with TaskStore(temp_store) as store:
+            low = store.list()[1]
+            store.set_priority(low["id"], 1)
+            # Ties keep store order, so the re-prioritized task now comes first
+            assert [t["title"] for t in store.list()] == ["Low", "High"]
+        
+        assert [t["title"] for t in list_tasks(temp_store)] == ["Low", "High"]
+
+    def test_sort_order_not_reused_after_same_stamp_rewrite(
+        self, temp_store, task_builder, monkeypatch
+    ):
+        # Pin the mtime after every save, as a coarse-grained filesystem would
+        real_replace = task_manager.os.replace
+        def replace_keeping_mtime(src, dst):
+            real_replace(src, dst)
+            task_manager.os.utime(dst, ns=(0, 0))
+        monkeypatch.setattr(task_manager.os, "replace", replace_keeping_mtime)
+        
+        task_builder.add("A", priority=3).add("B", priority=2).commit()
+        assert [t["title"] for t in list_tasks(temp_store)] == ["B", "A"]
+        # Same-length rewrite: priority 3 -> 1 leaves the file size unchanged
+        set_priority(temp_store, 1, 1)
+        assert [t["title"] for t in list_tasks(temp_store)] == ["A", "B"]
+
+    def test_search_index_not_reused_after_same_stamp_rewrite(
+        self, temp_store, task_builder, monkeypatch
+    ):
+        real_replace = task_manager.os.replace
+        def replace_keeping_mtime(src, dst):
+            real_replace(src, dst)
+            task_manager.os.utime(dst, ns=(0, 0))
+        monkeypatch.setattr(task_manager.os, "replace", replace_keeping_mtime)
+        
+        task_builder.add("A").add("B").commit()
+        assert search_tasks(temp_store, "c") == []
+        edit_task(temp_store, 2, title="C")
+        assert not any(k[0] == temp_store for k in task_manager._SEARCH_INDEXES)
+        assert [t["id"] for t in search_tasks(temp_store, "c")] == [2]
@@ -1,23 +1,16 @@
 """Unit tests for task_manager.py storage operations."""
 
 import pytest
-from pathlib import Path
 import json
-import tempfile
 from datetime import datetime, timezone
 
-from task_manager import add_task, complete_task, edit_task, delete_task, clear_tasks
+import task_manager
+from task_manager import add_task, complete_task, edit_task, delete_task, clear_tasks, list_tasks
 
 
-@pytest.fixture
-def temp_store():
-    """Create a temporary tasks.json file for testing."""
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json') as f:
-        temp_path = Path(f.name)
-    yield temp_path
-    # Cleanup
-    if temp_path.exists():
-        temp_path.unlink()
+def _read(path):
+    """Parse the store file with the stdlib, independently of task_manager's codec."""
+    return json.loads(path.read_bytes())
 
 
 class TestJSONStorage:
@@ -34,8 +27,7 @@ class TestJSONStorage:
         add_task(temp_store, title="Task 1")
         add_task(temp_store, title="Task 2")
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert isinstance(data, list)
         assert len(data) == 2
@@ -50,8 +42,7 @@ class TestJSONStorage:
             priority=1
         )
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         stored_task = data[0]
         assert stored_task["id"] == task["id"]
@@ -69,16 +60,14 @@ class TestJSONStorage:
         task3 = add_task(temp_store, title="Task 3", priority=1)
         
         # Verify all three are stored
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         assert len(data) == 3
         
         # Complete one
         complete_task(temp_store, task2["id"])
         
         # Verify all still present with correct status
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         assert len(data) == 3
         assert data[1]["status"] == "complete"
         assert data[0]["status"] == "pending"
@@ -112,8 +101,7 @@ class TestDataIntegrity:
         for title in titles:
             add_task(temp_store, title=title)
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         stored_titles = [t["title"] for t in data]
         assert stored_titles == titles
@@ -122,8 +110,7 @@ class TestDataIntegrity:
         """Verify null/None values are stored as JSON null."""
         add_task(temp_store, title="No Due Date", due_date=None, priority=3)
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert data[0]["due_date"] is None
 
@@ -131,8 +118,7 @@ class TestDataIntegrity:
         """Verify empty strings are preserved."""
         add_task(temp_store, title="Minimal Task", description="", priority=3)
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert data[0]["description"] == ""
 
@@ -141,8 +127,7 @@ class TestDataIntegrity:
         special_text = 'Test "quotes" and \\backslash\\ and \nnewline'
         add_task(temp_store, title=special_text, description=special_text)
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert data[0]["title"] == special_text
         assert data[0]["description"] == special_text
@@ -155,8 +140,7 @@ class TestStorageUpdates:
         
         complete_task(temp_store, task["id"])
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert data[0]["status"] == "complete"
 
@@ -166,8 +150,7 @@ class TestStorageUpdates:
         
         edit_task(temp_store, task["id"], title="Updated", description="New")
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert data[0]["title"] == "Updated"
         assert data[0]["description"] == "New"
@@ -180,8 +163,7 @@ class TestStorageUpdates:
         
         delete_task(temp_store, task2["id"])
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert len(data) == 2
         ids = [t["id"] for t in data]
@@ -197,8 +179,7 @@ class TestStorageUpdates:
         
         clear_tasks(temp_store)
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert data == []
 
@@ -251,13 +232,70 @@ class TestStorageEdgeCases:
         assert task["id"] == 6
 
 
+class TestAtomicWrite:
+    def test_no_temp_file_left_behind(self, temp_store):
+        """Verify the temporary file is renamed over the store."""
+        add_task(temp_store, title="Task")
+
+        tmp = temp_store.with_name(temp_store.name + ".tmp")
+        assert not tmp.exists()
+        assert _read(temp_store)[0]["title"] == "Task"
+
+    def test_failed_write_keeps_previous_contents(self, temp_store, monkeypatch):
+        """Verify a crash before the rename leaves the old store intact."""
+        add_task(temp_store, title="Survivor")
+        before = temp_store.read_text()
+
+        def boom(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(task_manager.os, "replace", boom)
+        with pytest.raises(OSError):
+            add_task(temp_store, title="Lost")
+
+        assert temp_store.read_text() == before
+        temp_store.with_name(temp_store.name + ".tmp").unlink()
+
+
+class TestParseCache:
+    def test_unchanged_file_is_parsed_once(self, temp_store, monkeypatch):
+        """Verify repeated loads of an unchanged file reuse the parsed tasks."""
+        temp_store.write_text(json.dumps([
+            {"id": 1, "title": "Task", "status": "pending", "priority": 3, "due_date": None},
+        ]))
+        calls = []
+        real_read = task_manager._read_json
+        monkeypatch.setattr(task_manager, "_read_json", lambda p: calls.append(p) or real_read(p))
+
+        list_tasks(temp_store)
+        list_tasks(temp_store)
+
+        assert len(calls) == 1
+
+    def test_cached_tasks_are_not_shared(self, temp_store):
+        """Verify mutating loaded tasks doesn't leak into later loads."""
+        add_task(temp_store, title="Original")
+
+        list_tasks(temp_store)[0]["title"] = "Mutated"
+
+        assert list_tasks(temp_store)[0]["title"] == "Original"
+
+    def test_external_change_is_reparsed(self, temp_store):
+        """Verify a file rewritten outside task_manager is read again."""
+        add_task(temp_store, title="Before")
+        temp_store.write_text(json.dumps([
+            {"id": 7, "title": "Rewritten elsewhere", "status": "pending", "priority": 3, "due_date": None},
+        ]))
+
+        assert [t["title"] for t in list_tasks(temp_store)] == ["Rewritten elsewhere"]
+
+
 class TestTimestampStorage:
     def test_created_at_is_stored(self, temp_store):
         """Verify created_at timestamp is stored."""
         task = add_task(temp_store, title="Timestamped Task")
         
-        with temp_store.open() as f:
-            data = json.load(f)
+        data = _read(temp_store)
         
         assert "created_at" in data[0]
         assert data[0]["created_at"] == task["created_at"]
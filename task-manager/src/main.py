@@ -3,12 +3,56 @@ import json
 import os
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib
+    orjson = None
+
+# Size of the write buffer used for tasks.json
+WRITE_BUFFER_SIZE = 64 * 1024
+
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+
+    def _dump(obj, f):
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+else:
+    _loads = json.loads
+    _pretty = json.JSONEncoder(indent=2)
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def _dump(obj, f):
+        # Stream the encoder's chunks into the buffered file
+        for chunk in _pretty.iterencode(obj):
+            f.write(chunk.encode('utf-8'))
+
+# New tasks are appended to tasks.wal one JSON line at a time; tasks.json is
+# only rewritten when the log grows past this size.
+WAL_CHECKPOINT_BYTES = 1024 * 1024
+# Appends are fsynced in groups of this many records
+WAL_FSYNC_EVERY = 64
+
 class TaskManager:
+    # Task files already created in this process, so further instances for
+    # the same file skip the makedirs/exists calls
+    _ensured_paths = set()
+
     def __init__(self, file_path):
         self.file_path = file_path
+        self.wal_path = os.path.splitext(file_path)[0] + '.wal'
+        self._wal_unsynced = 0
+        # Loaded task list and the (tasks.json, tasks.wal) stat it matches
+        self._tasks = None
+        self._stamp = None
         self._ensure_data_directory()
         
     def _ensure_data_directory(self):
+        if self.file_path in TaskManager._ensured_paths:
+            return
+
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
         
@@ -17,6 +61,8 @@ class TaskManager:
             with open(self.file_path, 'w') as f:
                 json.dump([], f)
 
+        TaskManager._ensured_paths.add(self.file_path)
+
     def add_task(self, title, description):
         tasks = self._load_tasks()
         new_id = len(tasks) + 1
@@ -26,22 +72,89 @@ class TaskManager:
             'description': description
         }
         tasks.append(task)
-        self._save_tasks(tasks)
+        self._append_wal({'op': 'add', 'task': task})
         return task
 
     def list_tasks(self):
-        return self._load_tasks()
+        return list(self._load_tasks())
+
+    def _file_stamp(self):
+        stamp = []
+        for path in (self.file_path, self.wal_path):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
 
     def _load_tasks(self):
+        # Re-read only when tasks.json or the WAL changed since the last load
+        stamp = self._file_stamp()
+        if self._tasks is not None and stamp == self._stamp:
+            return self._tasks
+        try:
+            with open(self.file_path, 'rb') as f:
+                tasks = _loads(f.read())
+        except FileNotFoundError:
+            tasks = []
+        self._tasks = self._replay_wal(tasks)
+        self._stamp = stamp
+        return self._tasks
+
+    def _replay_wal(self, tasks):
         try:
-            with open(self.file_path, 'r') as f:
-                return json.load(f)
+            with open(self.wal_path, 'rb') as f:
+                data = f.read()
         except FileNotFoundError:
-            return []
+            return tasks
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            # Cut off a record torn by a crash mid-append, so the next append
+            # starts on its own line instead of extending the broken one
+            os.truncate(self.wal_path, end)
+            data = data[:end]
+        # A crash between replacing tasks.json and removing the WAL in
+        # _checkpoint leaves records that are already in tasks.json
+        seen = {task['id'] for task in tasks}
+        for line in data.splitlines():
+            try:
+                record = _loads(line)
+            except json.JSONDecodeError:
+                continue  # damaged record; keep the ones after it
+            if record['op'] == 'add' and record['task']['id'] not in seen:
+                seen.add(record['task']['id'])
+                tasks.append(record['task'])
+        return tasks
+
+    def _append_wal(self, record):
+        with open(self.wal_path, 'ab') as f:
+            f.write(_dumps(record) + b'\n')
+            self._wal_unsynced += 1
+            if self._wal_unsynced >= WAL_FSYNC_EVERY:
+                f.flush()
+                os.fsync(f.fileno())
+                self._wal_unsynced = 0
+            size = f.tell()
+        self._stamp = self._file_stamp()
+        if size > WAL_CHECKPOINT_BYTES:
+            self._checkpoint()
+
+    def _checkpoint(self):
+        self._save_tasks(self._load_tasks())
+        os.remove(self.wal_path)
+        self._wal_unsynced = 0
+        self._stamp = self._file_stamp()
 
     def _save_tasks(self, tasks):
-        with open(self.file_path, 'w') as f:
-            json.dump(tasks, f, indent=2)
+        tmp = os.fspath(self.file_path) + '.tmp'
+        with open(tmp, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            _dump(tasks, f)
+            # Make sure the data is on disk before it replaces tasks.json
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.file_path)
 
 def main():
     # Initialize the task manager
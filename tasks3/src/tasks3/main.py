@@ -1,101 +1,321 @@
-import argparse
 import json
+import mmap
+import os
+import sys
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from enum import Enum
+from types import SimpleNamespace
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json writes the same files
+    orjson = None
+
+# Task files are written through a 64 KiB buffer so the stdlib encoder's many
+# small chunks turn into a handful of write() calls.
+WRITE_BUFFER_SIZE = 64 * 1024
+
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+
+    def _dump(obj, f):
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+else:
+    _loads = json.loads
+    _pretty = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _dump(obj, f):
+        for chunk in _pretty.iterencode(obj):
+            f.write(chunk.encode("utf-8"))
+
+def _read_json(path):
+    if orjson is None:
+        return _loads(path.read_bytes())
+    # orjson parses straight out of the mapped pages, skipping the copy into
+    # a bytes object that read() would make
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []  # mmap can't map an empty file; json treats it as corrupt anyway
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _loads(view)
 
 class Priority(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
+# Mutations are appended to tasks.wal as one JSON record per line and replayed
+# on load; tasks.json is only rewritten when the log is checkpointed.
+WAL_CHECKPOINT_BYTES = 1024 * 1024
+WAL_FSYNC_EVERY = 64
+
+# Task lists loaded in this process, shared across TaskManager instances:
+# file path -> ((tasks.json, tasks.wal) stat, tasks) of the instance that last
+# loaded or wrote the file. Other instances copy the list instead of parsing
+# the same bytes again; the owner keeps editing its own list in place.
+_PARSED = {}
+
 class TaskManager:
+    # Task files already set up in this process; directories and files aren't
+    # expected to vanish underneath us, so repeat instances skip the syscalls
+    _ensured_paths = set()
+
     def __init__(self, file_path):
         self.file_path = Path(file_path)
+        self.wal_path = self.file_path.with_suffix(".wal")
+        self._wal_unsynced = 0
+        # WAL records held back while inside batch()
+        self._pending = None
+        # Parsed task list and the (tasks.json, tasks.wal) stat it was read from
+        self._tasks = None
+        self._stamp = None
+        self._by_id = {}
+        # Lowercased (title, description) per task, parallel to _tasks; built
+        # by the first search and dropped when text changes out of order
+        self._search_text = None
+        # (completed, priority) columns parallel to _tasks for list_tasks'
+        # filters; built on demand and dropped when a task's flags change
+        self._status = None
+        self._next_id = 1
         self._ensure_data_directory()
         
     def _ensure_data_directory(self):
+        if self.file_path in TaskManager._ensured_paths:
+            return
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
         if not self.file_path.exists():
             self.file_path.write_text("[]", encoding="utf-8")
+        TaskManager._ensured_paths.add(self.file_path)
+
+    @contextmanager
+    def batch(self):
+        # Group several operations into one WAL append:
+        #   with tm.batch():
+        #       for title in titles:
+        #           tm.add_task(title, "")
+        if self._pending is not None:
+            yield self
+            return
+        self._load_tasks()
+        # Our list runs ahead of the files until the batch is written
+        _PARSED.pop(self.file_path, None)
+        self._pending = []
+        try:
+            yield self
+        finally:
+            records, self._pending = self._pending, None
+            if records:
+                self._write_wal(records)
 
     def add_task(self, title, description, priority="medium"):
         tasks = self._load_tasks()
-        new_id = max((t.get("id", 0) for t in tasks), default=0) + 1
+        new_id = self._next_id
+        self._next_id += 1
+        now = datetime.now().isoformat()
         task = {
             "id": new_id,
             "title": title,
             "description": description,
             "priority": priority,
             "completed": False,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
         tasks.append(task)
-        self._save_tasks(tasks)
+        self._by_id[new_id] = task
+        if self._search_text is not None:
+            self._search_text.append((title.lower(), description.lower()))
+        if self._status is not None:
+            self._status[0].append(False)
+            self._status[1].append(priority)
+        self._append_wal({"op": "add", "task": task})
         return task
 
     def list_tasks(self, show_completed=False, priority=None):
         tasks = self._load_tasks()
-        if not show_completed:
-            tasks = [t for t in tasks if not t.get("completed", False)]
-        if priority:
-            tasks = [t for t in tasks if t.get("priority") == priority]
-        return tasks
+        if show_completed and not priority:
+            return list(tasks)  # never hand out the cached list itself
+        if self._status is None:
+            self._status = ([t.get("completed", False) for t in tasks], [t.get("priority") for t in tasks])
+        completed, priorities = self._status
+        if not priority:
+            return [t for t, done in zip(tasks, completed) if not done]
+        if show_completed:
+            return [t for t, prio in zip(tasks, priorities) if prio == priority]
+        return [t for t, done, prio in zip(tasks, completed, priorities) if not done and prio == priority]
 
     def delete_task(self, task_id):
         tasks = self._load_tasks()
-        tasks = [t for t in tasks if t["id"] != task_id]
-        self._save_tasks(tasks)
+        task = self._by_id.pop(task_id, None)
+        if task is not None:
+            tasks.remove(task)
+            self._search_text = None
+            self._status = None
+            self._append_wal({"op": "delete", "id": task_id})
 
     def update_task(self, task_id, title=None, description=None, priority=None):
-        tasks = self._load_tasks()
-        updated = None
-        for t in tasks:
-            if t["id"] == task_id:
-                if title is not None:
-                    t["title"] = title
-                if description is not None:
-                    t["description"] = description
-                if priority is not None:
-                    t["priority"] = priority
-                t["updated_at"] = datetime.now().isoformat()
-                updated = t
-                break
-        if updated:
-            self._save_tasks(tasks)
-        return updated
+        self._load_tasks()
+        t = self._by_id.get(task_id)
+        if t:
+            if title is not None:
+                t["title"] = title
+            if description is not None:
+                t["description"] = description
+            if priority is not None:
+                t["priority"] = priority
+                self._status = None
+            if title is not None or description is not None:
+                self._search_text = None
+            t["updated_at"] = datetime.now().isoformat()
+            self._append_wal({"op": "update", "task": t})
+        return t
 
     def complete_task(self, task_id):
-        tasks = self._load_tasks()
-        completed = None
-        for t in tasks:
-            if t["id"] == task_id:
-                t["completed"] = True
-                t["completed_at"] = datetime.now().isoformat()
-                t["updated_at"] = t["completed_at"]
-                completed = t
-                break
-        if completed:
-            self._save_tasks(tasks)
-        return completed
+        self._load_tasks()
+        t = self._by_id.get(task_id)
+        if t:
+            now = datetime.now().isoformat()
+            if not t.get("completed", False):
+                self._status = None
+            t["completed"] = True
+            t["completed_at"] = now
+            t["updated_at"] = now
+            self._append_wal({"op": "complete", "task": t})
+        return t
 
     def search_tasks(self, query):
         tasks = self._load_tasks()
+        if self._search_text is None:
+            self._search_text = [(t["title"].lower(), t["description"].lower()) for t in tasks]
         q = query.lower()
-        return [t for t in tasks if q in t["title"].lower() or q in t["description"].lower()]
+        return [t for t, (title, desc) in zip(tasks, self._search_text) if q in title or q in desc]
+
+    def _file_stamp(self):
+        stamp = []
+        for path in (self.file_path, self.wal_path):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
 
     def _load_tasks(self):
+        stamp = self._file_stamp()
+        if self._tasks is not None and stamp == self._stamp:
+            return self._tasks
+        shared = _PARSED.get(self.file_path)
+        if shared is not None and shared[0] == stamp:
+            self._tasks = [dict(t) for t in shared[1]]
+        else:
+            try:
+                tasks = _read_json(self.file_path)
+            except FileNotFoundError:
+                tasks = []
+            except json.JSONDecodeError:
+                tasks = []
+            self._tasks = self._replay_wal(tasks)
+        self._stamp = stamp
+        self._publish()
+        self._search_text = None
+        self._status = None
+        self._by_id = {}
+        for t in self._tasks:
+            # The first task with an id wins, as the old linear scans did
+            self._by_id.setdefault(t["id"], t)
+        # Ids keep counting up from here until the files change under us
+        self._next_id = max((t.get("id", 0) for t in self._tasks), default=0) + 1
+        return self._tasks
+
+    def _replay_wal(self, tasks):
         try:
-            with self.file_path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            data = self.wal_path.read_bytes()
         except FileNotFoundError:
-            return []
-        except json.JSONDecodeError:
-            return []
+            return tasks
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            # A crash mid-append left a torn final record. Cut it off so the
+            # next append starts on a fresh line instead of extending it.
+            os.truncate(self.wal_path, end)
+            data = data[:end]
+        # Apply records to the first task with each id, in place, like the
+        # live operations do; later duplicates keep their place untouched
+        by_id = {}
+        for t in tasks:
+            by_id.setdefault(t["id"], t)
+        for line in data.splitlines():
+            try:
+                record = _loads(line)
+            except json.JSONDecodeError:
+                continue  # a damaged record; the ones after it are still valid
+            if record["op"] == "delete":
+                task = by_id.pop(record["id"], None)
+                if task is not None:
+                    tasks.remove(task)
+                continue
+            task = record["task"]
+            current = by_id.get(task["id"])
+            if current is None:
+                by_id[task["id"]] = task
+                tasks.append(task)
+            else:
+                # Also covers an add already checkpointed into tasks.json
+                current.clear()
+                current.update(task)
+        return tasks
+
+    def _append_wal(self, record):
+        if self._pending is not None:
+            self._pending.append(record)
+        else:
+            self._write_wal([record])
+
+    def _publish(self):
+        if self._pending is None:
+            _PARSED[self.file_path] = (self._stamp, self._tasks)
+
+    def _write_wal(self, records):
+        # Records are already applied to our list; unshare it until they are
+        # on disk, so a failed write can't leak them to other instances
+        _PARSED.pop(self.file_path, None)
+        with self.wal_path.open("ab") as f:
+            f.write(b"".join(_dumps(r) + b"\n" for r in records))
+            self._wal_unsynced += len(records)
+            if self._wal_unsynced >= WAL_FSYNC_EVERY:
+                f.flush()
+                os.fsync(f.fileno())
+                self._wal_unsynced = 0
+            size = f.tell()
+        self._stamp = self._file_stamp()
+        self._publish()
+        if size > WAL_CHECKPOINT_BYTES:
+            self.checkpoint()
+
+    def checkpoint(self):
+        # Fold the WAL into an indented tasks.json
+        self._save_tasks(self._load_tasks())
+        self.wal_path.unlink(missing_ok=True)
+        self._wal_unsynced = 0
+        self._stamp = self._file_stamp()
+        self._publish()
 
     def _save_tasks(self, tasks):
-        self.file_path.write_text(json.dumps(tasks, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp = self.file_path.with_suffix(".json.tmp")
+        with tmp.open("wb", buffering=WRITE_BUFFER_SIZE) as f:
+            _dump(tasks, f)
+            # The new file must be on disk before it replaces tasks.json and
+            # the WAL it was built from is deleted
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.file_path)
 
 def _print_tasks(tasks):
     if not tasks:
@@ -111,10 +331,9 @@ def _print_tasks(tasks):
             print(f"    Completed at: {t['completed_at']}")
         print()
 
-def main():
-    # Always use tasks2/data/tasks.json relative to this file
-    data_file = Path(__file__).resolve().parent.parent / "data" / "tasks.json"
-    task_manager = TaskManager(data_file)
+def _build_parser():
+    # argparse is only imported for invocations _parse_fast can't handle
+    import argparse
 
     parser = argparse.ArgumentParser(description="Enhanced Task Manager CLI")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
@@ -144,7 +363,35 @@ def main():
     search_parser = subparsers.add_parser("search", help="Search tasks")
     search_parser.add_argument("query", help="Search query")
 
-    args = parser.parse_args()
+    subparsers.add_parser("checkpoint", help="Write pending changes into tasks.json and clear the log")
+    return parser
+
+def _parse_fast(argv):
+    # Parse the common option-free invocations without building the argparse
+    # tree. Returns None for anything else (options, --help, bad ids), which
+    # then goes through _build_parser() for the usual parsing and errors.
+    if not argv or any(a.startswith("-") for a in argv):
+        return None
+    command, rest = argv[0], argv[1:]
+    if command == "add" and len(rest) == 2:
+        return SimpleNamespace(command=command, title=rest[0], description=rest[1], priority="medium")
+    if command == "list" and not rest:
+        return SimpleNamespace(command=command, all=False, priority=None)
+    if command in ("delete", "complete") and len(rest) == 1 and rest[0].isascii() and rest[0].isdigit():
+        return SimpleNamespace(command=command, task_id=int(rest[0]))
+    if command == "search" and len(rest) == 1:
+        return SimpleNamespace(command=command, query=rest[0])
+    if command == "checkpoint" and not rest:
+        return SimpleNamespace(command=command)
+    return None
+
+def main(argv=None):
+    # Always use tasks2/data/tasks.json relative to this file
+    data_file = Path(__file__).resolve().parent.parent / "data" / "tasks.json"
+    task_manager = TaskManager(data_file)
+
+    argv = sys.argv[1:] if argv is None else argv
+    args = _parse_fast(argv) or _build_parser().parse_args(argv)
 
     if args.command == "add":
         task = task_manager.add_task(args.title, args.description, args.priority)
@@ -172,8 +419,12 @@ def main():
             print(f"Found {len(tasks)} matching tasks:")
         _print_tasks(tasks)
 
+    elif args.command == "checkpoint":
+        task_manager.checkpoint()
+        print(f"Checkpointed {task_manager.file_path}")
+
     else:
-        parser.print_help()
+        _build_parser().print_help()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
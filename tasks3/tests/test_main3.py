@@ -1,3 +1,4 @@
+import json
 import sys
 import importlib
 from pathlib import Path
@@ -19,6 +20,7 @@ def test_add_task(tmp_path, main_module):
     assert t["title"] == "Title1"
     assert t["priority"] == "medium"
     assert t["completed"] is False
+    assert t["created_at"] == t["updated_at"]
 
 #testing taskmanager delete_task removes only the specified task after adding two tasks and deleting the first. list_tasks should return only the second task.
 def test_delete_task(tmp_path, main_module):
@@ -29,4 +31,264 @@ def test_delete_task(tmp_path, main_module):
     tm.delete_task(t1["id"])
     remaining = tm.list_tasks(show_completed=True)
     assert len(remaining) == 1
-    assert remaining[0]["id"] == t2["id"]
\ No newline at end of file
+    assert remaining[0]["id"] == t2["id"]
+
+#testing mutations are appended to tasks.wal and replayed by a fresh TaskManager, with tasks.json left untouched until a checkpoint
+def test_wal_replay(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    t1 = tm.add_task("A", "a")
+    t2 = tm.add_task("B", "b", priority="high")
+    tm.update_task(t2["id"], title="B2")
+    tm.complete_task(t2["id"])
+    tm.delete_task(t1["id"])
+    assert data_file.read_text(encoding="utf-8") == "[]"
+    assert len(data_file.with_suffix(".wal").read_text(encoding="utf-8").splitlines()) == 5
+    remaining = main_module.TaskManager(data_file).list_tasks(show_completed=True)
+    assert [(t["id"], t["title"], t["completed"]) for t in remaining] == [(2, "B2", True)]
+
+#testing a torn final WAL record (crash mid-append) is ignored while earlier records are kept
+def test_wal_torn_record(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("A", "a")
+    with data_file.with_suffix(".wal").open("ab") as f:
+        f.write(b'{"op":"add","task":{"id":2,')
+    assert [t["title"] for t in tm.list_tasks()] == ["A"]
+
+#testing records appended after a torn tail survive a reload in a fresh process
+def test_wal_append_after_torn_record(tmp_path, main_module, monkeypatch):
+    data_file = tmp_path / "data" / "tasks.json"
+    wal = data_file.with_suffix(".wal")
+    main_module.TaskManager(data_file).add_task("a", "")
+    with wal.open("ab") as f:
+        f.write(b'{"op":"add","task":{"id":2,')
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("b", "")
+    tm.add_task("c", "")
+    assert [t["title"] for t in tm.list_tasks()] == ["a", "b", "c"]
+    assert wal.read_bytes().endswith(b"}\n")
+    # A new process has no shared parse to copy from
+    monkeypatch.setattr(main_module, "_PARSED", {})
+    assert [t["title"] for t in main_module.TaskManager(data_file).list_tasks()] == ["a", "b", "c"]
+
+#testing a damaged record in the middle of the WAL is skipped without dropping later records
+def test_wal_skips_damaged_record(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    data_file.parent.mkdir()
+    data_file.write_text("[]", encoding="utf-8")
+    data_file.with_suffix(".wal").write_bytes(
+        b'{"op":"add","task":{"id":1,"title":"a","description":"","completed":false}}\n'
+        b'garbage\n'
+        b'{"op":"add","task":{"id":2,"title":"b","description":"","completed":false}}\n'
+    )
+    assert [t["title"] for t in main_module.TaskManager(data_file).list_tasks()] == ["a", "b"]
+
+#testing WAL records apply to the first task with a duplicated id and leave the later duplicate and the order alone
+def test_wal_replay_keeps_duplicate_ids(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    data_file.parent.mkdir()
+    data_file.write_text(json.dumps([
+        {"id": 1, "title": "first", "description": "", "completed": False},
+        {"id": 2, "title": "other", "description": "", "completed": False},
+        {"id": 1, "title": "dup", "description": "", "completed": False},
+    ]), encoding="utf-8")
+    data_file.with_suffix(".wal").write_bytes(
+        b'{"op":"update","task":{"id":1,"title":"edited","description":"","completed":false}}\n'
+        b'{"op":"add","task":{"id":3,"title":"new","description":"","completed":false}}\n'
+    )
+    tasks = main_module.TaskManager(data_file).list_tasks(show_completed=True)
+    assert [(t["id"], t["title"]) for t in tasks] == [(1, "edited"), (2, "other"), (1, "dup"), (3, "new")]
+
+#testing the WAL is folded into tasks.json and removed once it passes the checkpoint size
+def test_wal_checkpoint(tmp_path, main_module, monkeypatch):
+    monkeypatch.setattr(main_module, "WAL_CHECKPOINT_BYTES", 0)
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("A", "a")
+    assert not data_file.with_suffix(".wal").exists()
+    assert [t["title"] for t in json.loads(data_file.read_text(encoding="utf-8"))] == ["A"]
+
+#testing repeated reads reuse the parsed list and a change made through another TaskManager is still picked up
+def test_load_cache(tmp_path, main_module, monkeypatch):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("A", "a")
+    loads = []
+    real_loads = main_module._loads
+    monkeypatch.setattr(main_module, "_loads", lambda b: loads.append(1) or real_loads(b))
+    tm.list_tasks()
+    tm.search_tasks("a")
+    assert loads == []
+    main_module.TaskManager(data_file).add_task("B", "b")
+    assert [t["title"] for t in tm.list_tasks()] == ["A", "B"]
+
+#testing a checkpoint that fails before the rename leaves tasks.json and the WAL intact, so no task is lost
+def test_checkpoint_failure_keeps_data(tmp_path, main_module, monkeypatch):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("A", "a")
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(main_module.os, "replace", fail)
+    monkeypatch.setattr(main_module, "WAL_CHECKPOINT_BYTES", 0)
+    with pytest.raises(OSError):
+        tm.add_task("B", "b")
+    assert data_file.read_text(encoding="utf-8") == "[]"
+    monkeypatch.undo()
+    assert [t["title"] for t in main_module.TaskManager(data_file).list_tasks()] == ["A", "B"]
+
+#testing batch() applies every operation immediately in memory but appends them to the WAL in one write on exit
+def test_batch(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    wal = data_file.with_suffix(".wal")
+    tm = main_module.TaskManager(data_file)
+    with tm.batch():
+        for i in range(10):
+            tm.add_task(f"T{i}", "")
+        tm.complete_task(3)
+        assert len(tm.list_tasks()) == 9
+        assert not wal.exists()
+    assert len(wal.read_text(encoding="utf-8").splitlines()) == 11
+    tasks = main_module.TaskManager(data_file).list_tasks(show_completed=True)
+    assert [t["id"] for t in tasks] == list(range(1, 11))
+    assert [t["id"] for t in tasks if t["completed"]] == [3]
+
+#testing new ids continue from the highest id on disk, including tasks added by another TaskManager
+def test_next_id(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    assert [tm.add_task(t, "")["id"] for t in "ABC"] == [1, 2, 3]
+    assert main_module.TaskManager(data_file).add_task("D", "")["id"] == 4
+    assert tm.add_task("E", "")["id"] == 5
+
+#testing update/complete/delete find tasks by id and leave everything alone for an unknown id
+def test_lookup_by_id(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    for t in "ABC":
+        tm.add_task(t, "")
+    assert tm.update_task(2, title="B2")["title"] == "B2"
+    assert tm.complete_task(3)["completed"] is True
+    assert tm.update_task(9, title="X") is None
+    assert tm.complete_task(9) is None
+    tm.delete_task(9)
+    tm.delete_task(1)
+    tasks = main_module.TaskManager(data_file).list_tasks(show_completed=True)
+    assert [(t["id"], t["title"], t["completed"]) for t in tasks] == [(2, "B2", False), (3, "C", True)]
+
+#testing search_tasks matches title or description case-insensitively and reflects adds, edits and deletes made after an earlier search
+def test_search_tasks(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("Buy Milk", "from the store")
+    tm.add_task("Call mom", "about the STORE hours")
+    assert [t["id"] for t in tm.search_tasks("store")] == [1, 2]
+    tm.add_task("Milk again", "")
+    assert [t["id"] for t in tm.search_tasks("MILK")] == [1, 3]
+    tm.update_task(1, title="Buy bread")
+    tm.delete_task(3)
+    assert tm.search_tasks("milk") == []
+    assert [t["id"] for t in tm.search_tasks("bread")] == [1]
+
+#testing an empty or corrupted tasks.json loads as an empty list
+@pytest.mark.parametrize("content", ["", "{not json"])
+def test_unreadable_file(tmp_path, main_module, content):
+    data_file = tmp_path / "data" / "tasks.json"
+    data_file.parent.mkdir()
+    data_file.write_text(content, encoding="utf-8")
+    tm = main_module.TaskManager(data_file)
+    assert tm.list_tasks() == []
+    assert tm.add_task("A", "a")["id"] == 1
+
+#testing checkpoint() writes the current tasks to an indented tasks.json and clears the WAL
+def test_checkpoint(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("A", "a")
+    tm.add_task("B", "b")
+    tm.delete_task(1)
+    tm.checkpoint()
+    assert not data_file.with_suffix(".wal").exists()
+    text = data_file.read_text(encoding="utf-8")
+    assert text.startswith("[\n  {")
+    assert [t["title"] for t in json.loads(text)] == ["B"]
+    assert [t["title"] for t in tm.list_tasks()] == ["B"]
+
+#testing the argparse-free fast path parses common commands exactly as argparse does and defers everything else
+@pytest.mark.parametrize("argv", [
+    ["add", "Title", "Desc"],
+    ["list"],
+    ["delete", "3"],
+    ["complete", "12"],
+    ["search", "milk"],
+    ["checkpoint"],
+])
+def test_parse_fast_matches_argparse(main_module, argv):
+    fast = main_module._parse_fast(argv)
+    assert fast is not None
+    assert vars(fast) == vars(main_module._build_parser().parse_args(argv))
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["--help"],
+    ["add", "Title"],
+    ["add", "Title", "Desc", "--priority", "high"],
+    ["list", "--all"],
+    ["delete", "x"],
+    ["complete", "-1"],
+    ["update", "1", "--title", "T"],
+])
+def test_parse_fast_defers(main_module, argv):
+    assert main_module._parse_fast(argv) is None
+
+#testing a second TaskManager for an already set-up file skips the directory/file setup but sees the same tasks
+def test_ensure_data_directory_once(tmp_path, main_module, monkeypatch):
+    data_file = tmp_path / "data" / "tasks.json"
+    main_module.TaskManager(data_file).add_task("A", "a")
+    monkeypatch.setattr(main_module.Path, "mkdir", lambda *a, **k: pytest.fail("mkdir called again"))
+    assert [t["title"] for t in main_module.TaskManager(data_file).list_tasks()] == ["A"]
+
+#testing list_tasks filters by completion and priority, staying correct as tasks are added, completed, reprioritized and deleted between calls
+def test_list_tasks_filters(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("A", "", priority="high")
+    tm.add_task("B", "", priority="low")
+    assert [t["id"] for t in tm.list_tasks(priority="high")] == [1]
+    tm.add_task("C", "", priority="high")
+    tm.complete_task(1)
+    assert [t["id"] for t in tm.list_tasks(priority="high")] == [3]
+    assert [t["id"] for t in tm.list_tasks(show_completed=True, priority="high")] == [1, 3]
+    tm.update_task(2, priority="high")
+    tm.delete_task(3)
+    assert [t["id"] for t in tm.list_tasks(priority="high")] == [2]
+    assert [t["id"] for t in tm.list_tasks()] == [2]
+
+#testing a new TaskManager for an unchanged file copies the already-parsed list instead of reading it again, and edits stay per instance until written
+def test_parse_shared_across_instances(tmp_path, main_module, monkeypatch):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm1 = main_module.TaskManager(data_file)
+    tm1.add_task("A", "a")
+    reads = []
+    real_read = main_module._read_json
+    monkeypatch.setattr(main_module, "_read_json", lambda p: reads.append(p) or real_read(p))
+    tm2 = main_module.TaskManager(data_file)
+    assert [t["title"] for t in tm2.list_tasks()] == ["A"]
+    assert reads == []
+    with tm1.batch():
+        tm1.update_task(1, title="A2")
+        assert [t["title"] for t in tm2.list_tasks()] == ["A"]
+        assert [t["title"] for t in main_module.TaskManager(data_file).list_tasks()] == ["A"]
+    assert [t["title"] for t in tm2.list_tasks()] == ["A2"]
+
+#testing changing the list returned by list_tasks leaves the manager's tasks unchanged
+def test_list_tasks_returns_copy(tmp_path, main_module):
+    data_file = tmp_path / "data" / "tasks.json"
+    tm = main_module.TaskManager(data_file)
+    tm.add_task("A", "a")
+    tm.add_task("B", "b")
+    for kwargs in ({"show_completed": True}, {}, {"show_completed": True, "priority": "medium"}):
+        tm.list_tasks(**kwargs).clear()
+    assert [t["title"] for t in tm.list_tasks(show_completed=True)] == ["A", "B"]
+    assert [t["title"] for t in main_module.TaskManager(data_file).list_tasks(show_completed=True)] == ["A", "B"]
@@ -1,8 +1,67 @@
+import json
 import os
-from dotenv import load_dotenv
-from openai import OpenAI
+
+MODEL = "gpt-4o-mini"
+SUMMARY_INSTRUCTION = "Summarize the following task description as a short phrase (5 words or less)."
+BATCH_INSTRUCTION = (
+    "Summarize each of the following {count} numbered task descriptions as a short phrase (5 words or less). "
+    'Reply with a JSON object of the form {{"summaries": ["...", ...]}} containing exactly one summary per task, in order.'
+)
+
+async def _summarize_batch(client, descriptions):
+    # One request for every description; returns None if the reply isn't a
+    # JSON list with one summary per task
+    response = await client.chat.completions.create(
+        model=MODEL,
+        response_format={"type": "json_object"},
+        messages=[
+            {"role": "system", "content": BATCH_INSTRUCTION.format(count=len(descriptions))},
+            {"role": "user", "content": "\n\n".join(f"[{i}] {d}" for i, d in enumerate(descriptions, 1))}
+        ]
+    )
+    try:
+        summaries = json.loads(response.choices[0].message.content)["summaries"]
+    except (TypeError, ValueError, KeyError):
+        return None
+    if not isinstance(summaries, list) or len(summaries) != len(descriptions):
+        return None
+    if not all(isinstance(summary, str) for summary in summaries):
+        return None
+    return summaries
+
+async def _summarize_each(client, descriptions):
+    import asyncio
+
+    # One request per description, all sent at once so the total wait is
+    # about one round trip
+    responses = await asyncio.gather(*(
+        client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": SUMMARY_INSTRUCTION},
+                {"role": "user", "content": description}
+            ]
+        )
+        for description in descriptions
+    ))
+    return [response.choices[0].message.content for response in responses]
+
+async def summarize_all(descriptions):
+    from openai import AsyncOpenAI
+
+    async with AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")) as client:
+        summaries = await _summarize_batch(client, descriptions)
+        if summaries is None:
+            summaries = await _summarize_each(client, descriptions)
+    return summaries
 
 def summarize_tasks():
+    # asyncio, dotenv and openai are imported where they are used so importing
+    # this module stays cheap; openai alone takes a few hundred milliseconds
+    import asyncio
+
+    from dotenv import load_dotenv
+
     load_dotenv()  # Load .env file
     
     # Sample paragraph-length task descriptions
@@ -12,20 +71,8 @@ def summarize_tasks():
         "My goal is to organize the home office which has become cluttered over the past few months. This involves sorting through all the papers and documents, filing important ones and shredding old receipts, reorganizing the bookshelf by category, cleaning out the desk drawers, and setting up a better cable management system for all the electronics. I should also consider getting some storage boxes for items I don't use frequently."
     ]
     
-    # Initialize OpenAI client
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    
-    # Loop through and summarize each description
-    for i, description in enumerate(descriptions, 1):
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "Summarize the following task description as a short phrase (5 words or less)."},
-                {"role": "user", "content": description}
-            ]
-        )
-        
-        summary = response.choices[0].message.content
+    summaries = asyncio.run(summarize_all(descriptions))
+    for i, summary in enumerate(summaries, 1):
         print(f"Task {i}: {summary}")
 
 if __name__ == "__main__":
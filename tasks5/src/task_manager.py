@@ -1,29 +1,92 @@
 import json
 import os
 import sys
-import argparse
-
-TASKS_FILE = os.path.join(os.path.dirname(__file__), '..', 'data', 'tasks.json')
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to the stdlib
+    orjson = None
+
+# Resolved once, so later file calls get a plain absolute path without '..'
+TASKS_FILE = Path(__file__).resolve().parent.parent / 'data' / 'tasks.json'
+TASKS_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+# json.dump emits many small chunks; a 64 KiB buffer batches them into few writes
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Last parsed task list and the (mtime_ns, size) of TASKS_FILE it came from,
+# so repeated calls in one process skip re-reading an unchanged file.
+_cached_tasks = None
+_cached_stamp = None
+# Id for the next add_task, counted from the cached list
+_next_id = 1
+# id -> task for the cached list
+_by_id = {}
+
+def _index(tasks):
+    global _by_id
+    _by_id = {}
+    for t in tasks:
+        _by_id.setdefault(t.get('id'), t)
 
-def load_tasks():
-    if not os.path.exists(TASKS_FILE):
-        return []
+def _file_stamp():
     try:
-        with open(TASKS_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except json.JSONDecodeError:
-        return []
+        st = TASKS_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
 
-def save_tasks(tasks):
-    with open(TASKS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tasks, f, indent=2)
+def load_tasks():
+    global _cached_tasks, _cached_stamp, _next_id
+    stamp = _file_stamp()
+    if _cached_tasks is not None and stamp == _cached_stamp:
+        return _cached_tasks
+    data = []
+    if stamp is not None:
+        try:
+            with TASKS_FILE.open('rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            data = data if isinstance(data, list) else []
+        except json.JSONDecodeError:
+            data = []
+    _cached_tasks, _cached_stamp = data, stamp
+    _index(data)
+    _next_id = max((t.get('id', 0) for t in data), default=0) + 1
+    return data
+
+def save_tasks(tasks, pretty=False):
+    global _cached_tasks, _cached_stamp
+    # Write a temp file, fsync it and rename it over TASKS_FILE, so a crash
+    # leaves either the old or the new list, never a truncated file
+    tmp = TASKS_FILE.with_name(TASKS_FILE.name + '.tmp')
+    # Writes after each command are compact; `pretty` is for the pretty command
+    if orjson is not None:
+        with open(tmp, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(orjson.dumps(tasks, option=orjson.OPT_INDENT_2 if pretty else 0))
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        with open(tmp, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            if pretty:
+                json.dump(tasks, f, indent=2)
+            else:
+                json.dump(tasks, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, TASKS_FILE)
+    if tasks is not _cached_tasks:
+        _index(tasks)
+    _cached_tasks, _cached_stamp = tasks, _file_stamp()
 
 def add_task(title):
+    global _next_id
     tasks = load_tasks()
-    next_id = (max([t.get('id', 0) for t in tasks]) + 1) if tasks else 1
-    task = {"id": next_id, "title": title, "completed": False}
+    task = {"id": _next_id, "title": title, "completed": False}
+    _next_id += 1
     tasks.append(task)
+    _by_id[task['id']] = task
     save_tasks(tasks)
     print(f"Added: [{task['id']}] {task['title']}")
 
@@ -38,27 +101,34 @@ def list_tasks():
 
 def complete_task(task_id):
     tasks = load_tasks()
-    for t in tasks:
-        if t.get('id') == task_id:
-            if t.get('completed'):
-                print(f"Already completed: {task_id}")
-            else:
-                t['completed'] = True
-                print(f"Completed: {task_id}")
-            save_tasks(tasks)
-            return
-    print(f"Not found: {task_id}")
+    t = _by_id.get(task_id)
+    if t is None:
+        print(f"Not found: {task_id}")
+        return
+    if t.get('completed'):
+        print(f"Already completed: {task_id}")
+    else:
+        t['completed'] = True
+        print(f"Completed: {task_id}")
+    save_tasks(tasks)
 
 def delete_task(task_id):
     tasks = load_tasks()
-    new_tasks = [t for t in tasks if t.get('id') != task_id]
-    if len(new_tasks) == len(tasks):
+    task = _by_id.pop(task_id, None)
+    if task is None:
         print(f"Not found: {task_id}")
         return
-    save_tasks(new_tasks)
+    tasks.remove(task)
+    save_tasks(tasks)
     print(f"Deleted: {task_id}")
 
+def pretty_tasks():
+    save_tasks(load_tasks(), pretty=True)
+    print(f"Formatted: {TASKS_FILE}")
+
 def build_parser():
+    import argparse  # only needed when run_fast() can't handle the command line
+
     p = argparse.ArgumentParser(prog="task-manager", description="CLI Task Manager")
     sub = p.add_subparsers(dest="command", required=True)
 
@@ -73,10 +143,32 @@ def build_parser():
     pd = sub.add_parser("delete", help="Delete task")
     pd.add_argument("id", type=int, help="Task id")
 
+    sub.add_parser("pretty", help="Rewrite the tasks file indented for reading")
+
     return p
 
+# Runs option-free commands without building the argparse parser. Returns
+# False for anything else (options, --help, bad ids) so main() falls back.
+def run_fast(argv):
+    if not argv or any(a.startswith('-') for a in argv):
+        return False
+    command, rest = argv[0], argv[1:]
+    if command == "add" and rest:
+        add_task(" ".join(rest))
+    elif command == "list" and not rest:
+        list_tasks()
+    elif command == "pretty" and not rest:
+        pretty_tasks()
+    elif command in ("complete", "delete") and len(rest) == 1 and rest[0].isascii() and rest[0].isdigit():
+        (complete_task if command == "complete" else delete_task)(int(rest[0]))
+    else:
+        return False
+    return True
+
 def main(argv=None):
     argv = argv if argv is not None else sys.argv[1:]
+    if run_fast(argv):
+        return 0
     parser = build_parser()
     args = parser.parse_args(argv)
 
@@ -88,6 +180,8 @@ def main(argv=None):
         complete_task(args.id)
     elif args.command == "delete":
         delete_task(args.id)
+    elif args.command == "pretty":
+        pretty_tasks()
     return 0
 
 if __name__ == "__main__":